@@ -11,7 +11,7 @@
     'author': "My Company",
     'website': "https://www.yourcompany.com",
     'category': 'Uncategorized',
-    'version': '17.0.0.1',
+    'version': '17.0.0.3',
     'license': 'LGPL-3',
 
     'depends': ['base','mail','hr'],
@@ -19,11 +19,17 @@
     'data': [
         'security/security.xml',
         'security/ir.model.access.csv',
+        'data/ir_sequence_data.xml',
+        'data/ir_cron_data.xml',
+        'data/ir_actions_server_data.xml',
         'views/inspectors_views.xml',
         'views/violations.xml',
         'views/penalties.xml',
         'views/inspection_type_views.xml',
         'views/plans_visits.xml',
+        'views/visit_report_views.xml',
+        'views/item_import_views.xml',
+        'wizard/visit_generate_views.xml',
         'views/menus.xml',
     ],
 }
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+from . import attachment
+from . import export
+from . import sync
@@ -0,0 +1,28 @@
+from odoo import http
+from odoo.exceptions import AccessError
+from odoo.http import request
+
+
+class InspectionAttachmentController(http.Controller):
+
+    @http.route('/inspection/attachment/lookup', type='json', auth='user')
+    def lookup(self, checksum):
+        """Return the visit attachment with SHA-1 ``checksum``, if any. The
+        thumbnail URL is resized on demand by ``/web/image``, nothing is
+        generated when files are uploaded."""
+        attachment = request.env['inspection.visit']._find_attachment(checksum)
+        if not attachment:
+            return False
+        try:
+            attachment.check('read')
+        except AccessError:
+            return False
+        values = {
+            'id': attachment.id,
+            'name': attachment.name,
+            'mimetype': attachment.mimetype,
+            'file_size': attachment.file_size,
+        }
+        if attachment.mimetype in ('image/jpeg', 'image/png'):
+            values['thumbnail_url'] = f'/web/image/{attachment.id}/128x128?unique={attachment.checksum}'
+        return values
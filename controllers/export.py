@@ -0,0 +1,43 @@
+from werkzeug.wsgi import wrap_file
+
+from odoo import http
+from odoo.http import request, content_disposition
+from odoo.tools import str2bool
+
+EXPORT_DATASETS = {
+    'visits': 'inspection.visit',
+    'checklists': 'inspection.item',
+}
+
+
+class InspectionExportController(http.Controller):
+
+    @http.route('/inspection/export/<string:dataset>', type='http', auth='user', methods=['GET'])
+    def export(self, dataset, format='csv', per_plan='0', include_archived='0', date_from=None, date_to=None, plan_ids=None, **kwargs):
+        """Stream visits or checklist results as CSV or XLSX, optionally
+        zipped per plan. Visits can be filtered on their start date and plans,
+        archived visits are only exported with ``include_archived``."""
+        if dataset not in EXPORT_DATASETS:
+            raise request.not_found()
+        domain = []
+        if dataset == 'visits':
+            if date_from:
+                domain.append(('start_date', '>=', date_from))
+            if date_to:
+                domain.append(('start_date', '<=', date_to))
+            if plan_ids:
+                domain.append(('plan_id', 'in', [int(plan_id) for plan_id in plan_ids.split(',')]))
+        fileobj, filename, mimetype = request.env['inspection.export'].export(
+            EXPORT_DATASETS[dataset], domain, file_format=format, per_plan=str2bool(per_plan, default=False),
+            include_archived=str2bool(include_archived, default=False),
+        )
+        fileobj.seek(0, 2)
+        size = fileobj.tell()
+        fileobj.seek(0)
+        response = request.make_response(wrap_file(request.httprequest.environ, fileobj), headers=[
+            ('Content-Type', mimetype),
+            ('Content-Length', size),
+            ('Content-Disposition', content_disposition(filename)),
+        ])
+        response.direct_passthrough = True
+        return response
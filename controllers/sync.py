@@ -0,0 +1,23 @@
+import gzip
+import json
+
+from odoo import http
+from odoo.http import request
+from odoo.tools.date_utils import json_default
+
+
+class InspectionSyncController(http.Controller):
+
+    @http.route('/inspection/sync', type='http', auth='user', methods=['GET'])
+    def sync(self, cursor=None, limit=500, **kwargs):
+        """Return the visits and checklists changed since ``cursor`` as a
+        compact JSON page, gzip-compressed when the client accepts it."""
+        limit = max(1, min(int(limit), 5000))
+        page = request.env['inspection.sync'].get_changes(cursor=cursor, limit=limit)
+        body = json.dumps(page, default=json_default, separators=(',', ':')).encode()
+        headers = [('Content-Type', 'application/json'), ('Cache-Control', 'no-store')]
+        if 'gzip' in request.httprequest.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            headers.append(('Content-Encoding', 'gzip'))
+        headers.append(('Content-Length', len(body)))
+        return request.make_response(body, headers=headers)
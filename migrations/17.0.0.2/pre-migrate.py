@@ -0,0 +1,33 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Report and rename the visits sharing a name within a plan, so that the
+    unique (plan_id, name) constraint of inspection.visit can be created."""
+    cr.execute("""
+        SELECT plan_id, name, array_agg(id ORDER BY id)
+          FROM inspection_visit
+      GROUP BY plan_id, name
+        HAVING count(*) > 1
+    """)
+    duplicates = cr.fetchall()
+    if not duplicates:
+        return
+    for plan_id, name, visit_ids in duplicates:
+        _logger.warning(
+            "Inspection plan %s has %s visits named %r (ids %s); all but the first are renamed.",
+            plan_id, len(visit_ids), name, visit_ids,
+        )
+    cr.execute("""
+        UPDATE inspection_visit visit
+           SET name = left(visit.name, 230) || ' (' || visit.id || ')'
+          FROM (
+                SELECT id, row_number() OVER (PARTITION BY plan_id, name ORDER BY id) AS position
+                  FROM inspection_visit
+               ) duplicate
+         WHERE duplicate.id = visit.id
+           AND duplicate.position > 1
+    """)
+    _logger.warning("Renamed %s duplicate inspection visits.", cr.rowcount)
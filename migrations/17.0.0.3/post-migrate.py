@@ -0,0 +1,9 @@
+def migrate(cr, version):
+    """Date the plans completed before completion dates were recorded, so
+    that they can be archived; their last write is the closest estimate."""
+    cr.execute("""
+        UPDATE inspection_plan
+           SET completion_date = write_date
+         WHERE status = 'completed'
+           AND completion_date IS NULL
+    """)
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from . import validation
 from . import inspectors
 from . import violations
 from . import penalties
 from . import inspection_types
-from . import plans_visits
\ No newline at end of file
+from . import plans_visits
+from . import visit_report
+from . import sync
+from . import export
+from . import item_import
@@ -0,0 +1,156 @@
+import csv
+import io
+import re
+import shutil
+import tempfile
+import zipfile
+
+from odoo import api, models, _
+from odoo.exceptions import UserError
+from odoo.osv import expression
+from odoo.tools.misc import xlsxwriter
+
+EXPORT_CHUNK_SIZE = 1000
+# size of the blocks flushed from the csv buffer
+EXPORT_BLOCK_SIZE = 64 * 1024
+# explicit columns of each export, the ORM never loads more than these
+EXPORT_FIELDS = {
+    'inspection.visit': ['name', 'target_entity', 'start_date', 'end_date', 'status', 'plan_id', 'inspector'],
+    'inspection.item': ['inspection_type_id', 'sequence', 'name', 'item_type', 'is_mandatory',
+                        'response', 'correct_response', 'score'],
+}
+EXPORT_FORMATS = {
+    'csv': 'text/csv;charset=utf8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class InspectionExport(models.AbstractModel):
+    """Streaming export of visits and checklist results.
+
+    Records are read in id-ordered chunks and written row by row to a
+    temporary file, so that the memory used does not depend on the number
+    of exported rows. The file is then streamed to the client.
+    """
+    _name = 'inspection.export'
+    _description = 'Inspection Streaming Export'
+
+    @api.model
+    def _get_formatter(self, field):
+        if field.type == 'many2one':
+            return lambda value: value[1] if value else ''
+        if field.type == 'selection':
+            labels = dict(field._description_selection(self.env))
+            return lambda value: labels.get(value, '')
+        if field.type in ('date', 'datetime'):
+            return lambda value: field.to_string(value) if value else ''
+        if field.type == 'boolean':
+            return bool
+        return lambda value: '' if value is False else value
+
+    @api.model
+    def _get_headers(self, model_name):
+        model_fields = self.env[model_name]._fields
+        return [model_fields[field_name].string for field_name in EXPORT_FIELDS[model_name]]
+
+    @api.model
+    def _iter_rows(self, model_name, domain, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield the formatted rows of ``model_name`` matching ``domain`` in
+        id order, keeping a single chunk of records in memory."""
+        model = self.env[model_name]
+        field_names = EXPORT_FIELDS[model_name]
+        formatters = [self._get_formatter(model._fields[field_name]) for field_name in field_names]
+        self.env.flush_all()
+        last_id = 0
+        while True:
+            rows = model.search_read(
+                expression.AND([domain, [('id', '>', last_id)]]), field_names, order='id', limit=chunk_size,
+            )
+            for row in rows:
+                yield [formatter(row[field_name]) for formatter, field_name in zip(formatters, field_names)]
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1]['id']
+            # forget the records of this chunk and of their relations
+            self.env.invalidate_all(flush=False)
+
+    @api.model
+    def _write_csv(self, fileobj, headers, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= EXPORT_BLOCK_SIZE:
+                fileobj.write(buffer.getvalue().encode())
+                buffer.seek(0)
+                buffer.truncate()
+        fileobj.write(buffer.getvalue().encode())
+
+    @api.model
+    def _write_xlsx(self, fileobj, headers, rows):
+        # constant_memory flushes every row to disk once the next one starts
+        workbook = xlsxwriter.Workbook(fileobj, {'constant_memory': True})
+        worksheet = workbook.add_worksheet()
+        header_style = workbook.add_format({'bold': True})
+        worksheet.write_row(0, 0, headers, header_style)
+        for row_index, row in enumerate(rows, 1):
+            worksheet.write_row(row_index, 0, row)
+        workbook.close()
+
+    @api.model
+    def _write_file(self, fileobj, model_name, domain, file_format, chunk_size):
+        rows = self._iter_rows(model_name, domain, chunk_size=chunk_size)
+        if file_format == 'xlsx':
+            self._write_xlsx(fileobj, self._get_headers(model_name), rows)
+        else:
+            self._write_csv(fileobj, self._get_headers(model_name), rows)
+
+    @api.model
+    def _write_plan_archive(self, fileobj, domain, file_format, chunk_size):
+        """Write one file of visits per plan into a zip archive."""
+        with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for plan, in self.env['inspection.visit']._read_group(domain, ['plan_id'], order='plan_id'):
+                name = re.sub(r'[^\w.-]+', '_', plan.name or '').strip('_')
+                with tempfile.TemporaryFile() as plan_file:
+                    self._write_file(plan_file, 'inspection.visit', expression.AND([domain, [('plan_id', '=', plan.id)]]),
+                                     file_format, chunk_size)
+                    plan_file.seek(0)
+                    with archive.open(f'{name}-{plan.id}.{file_format}', 'w') as entry:
+                        shutil.copyfileobj(plan_file, entry)
+
+    @api.model
+    def export(self, model_name, domain=None, file_format='csv', per_plan=False, include_archived=False,
+               chunk_size=EXPORT_CHUNK_SIZE):
+        """Export the records of ``model_name`` to a temporary file.
+
+        :param str model_name: ``inspection.visit`` or ``inspection.item``
+        :param list domain: records to export, all of them by default
+        :param str file_format: ``csv`` or ``xlsx``
+        :param bool per_plan: zip one file per plan (visits only)
+        :param bool include_archived: also export archived visits
+        :return: tuple ``(fileobj, filename, mimetype)``, the file being
+            positioned at its start; the caller closes it
+        """
+        if model_name not in EXPORT_FIELDS:
+            raise UserError(_("The records of %s cannot be exported.", model_name))
+        if file_format not in EXPORT_FORMATS:
+            raise UserError(_("Unsupported export format: %s.", file_format))
+        if per_plan and model_name != 'inspection.visit':
+            raise UserError(_("Only visits can be exported per plan."))
+        domain = domain or []
+        self = self.with_context(active_test=not include_archived)
+        basename = self.env[model_name]._description.lower().replace(' ', '_')
+        fileobj = tempfile.TemporaryFile()
+        try:
+            if per_plan:
+                self._write_plan_archive(fileobj, domain, file_format, chunk_size)
+                filename, mimetype = f'{basename}s.zip', 'application/zip'
+            else:
+                self._write_file(fileobj, model_name, domain, file_format, chunk_size)
+                filename, mimetype = f'{basename}s.{file_format}', EXPORT_FORMATS[file_format]
+        except Exception:
+            fileobj.close()
+            raise
+        fileobj.seek(0)
+        return fileobj, filename, mimetype
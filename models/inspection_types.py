@@ -1,5 +1,24 @@
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.sql import create_index, create_unique_index
+from datetime import timedelta
+from collections import defaultdict, namedtuple
+
+HISTORY_BUFFER_KEY = 'inspection.history.buffer'
+HISTORY_PREVIEW_SIZE = 20
+# item fields compiled into checklist templates
+TEMPLATE_FIELDS = {'name', 'sequence', 'score', 'is_mandatory', 'display_type', 'inspection_type_id'}
+
+# allowed source states of every target state
+STATE_TRANSITIONS = {
+    'to_approve': ('draft',),
+    'approved': ('to_approve',),
+    'draft': ('to_approve', 'approved', 'cancelled'),
+    'cancelled': ('draft', 'to_approve', 'approved'),
+}
+
+ChecklistSection = namedtuple('ChecklistSection', ['id', 'name', 'items'])
+ChecklistItem = namedtuple('ChecklistItem', ['id', 'name', 'score', 'is_mandatory'])
 
 
 class InspectionType(models.Model):
@@ -62,6 +81,30 @@ class InspectionType(models.Model):
         string="Required Minimum Score",
         help="Minimum score required for passing"
     )
+    max_score = fields.Float(
+        string="Maximum Score",
+        compute='_compute_score',
+        store=True
+    )
+    total_score = fields.Float(
+        string="Score",
+        compute='_compute_score',
+        store=True,
+        help="Sum of the scores of the correctly answered items"
+    )
+    mandatory_failed_count = fields.Integer(
+        string="Failed Mandatory Items",
+        compute='_compute_score',
+        store=True
+    )
+    result = fields.Selection(
+        [('pass', 'Passed'),
+         ('fail', 'Failed')],
+        string="Result",
+        compute='_compute_score',
+        store=True,
+        help="Passed when the score reaches the required minimum score and every mandatory item is correct"
+    )
 
     # -----------------------------------------------------------------------------------------------------------------
 
@@ -70,25 +113,255 @@ class InspectionType(models.Model):
         'inspection_type_id',
         string="History"
     )
+    recent_history_ids = fields.One2many(
+        'inspection.history',
+        compute='_compute_recent_history_ids',
+        string="Recent History"
+    )
+    history_count = fields.Integer(compute='_compute_history_count', string="History Count")
+
+    @api.depends('required_minimum_score', 'inspection_items.item_type', 'inspection_items.score',
+                 'inspection_items.correct_response', 'inspection_items.is_mandatory')
+    def _compute_score(self):
+        """Aggregate the item scores of all stored types with one grouped
+        query; sections are not scored. Types being edited in a form are
+        scored from their lines."""
+        totals = defaultdict(lambda: {'max_score': 0.0, 'total_score': 0.0, 'mandatory_failed_count': 0})
+        stored_types = self.filtered('id')
+        if stored_types:
+            for inspection_type, correct, mandatory, score, count in self.env['inspection.item']._read_group(
+                    [('inspection_type_id', 'in', stored_types.ids), ('item_type', '=', 'item')],
+                    ['inspection_type_id', 'correct_response', 'is_mandatory'], ['score:sum', '__count']):
+                self._add_score(totals[inspection_type.id], correct, mandatory, score or 0.0, count)
+        for rec in self - stored_types:
+            for item in rec.inspection_items.filtered(lambda line: line.item_type == 'item'):
+                self._add_score(totals[rec.id], item.correct_response, item.is_mandatory, item.score, 1)
+
+        for rec in self:
+            rec_totals = totals[rec.id]
+            rec.max_score = rec_totals['max_score']
+            rec.total_score = rec_totals['total_score']
+            rec.mandatory_failed_count = rec_totals['mandatory_failed_count']
+            passed = (
+                rec.total_score >= rec.required_minimum_score
+                and not rec.mandatory_failed_count
+            )
+            rec.result = 'pass' if passed else 'fail'
 
     @api.model
-    def create(self, vals):
-        if not vals.get('name'):
-            vals['name'] = self.env['ir.sequence'].next_by_code('inspection.type') or _('New')
-        return super(InspectionType, self).create(vals)
+    def _add_score(self, totals, correct, mandatory, score, count):
+        totals['max_score'] += score
+        if correct:
+            totals['total_score'] += score
+        elif mandatory:
+            totals['mandatory_failed_count'] += count
+
+    def _get_section_scores(self):
+        """Return the (score, maximum score) subtotal of every section of the
+        types in ``self``, keyed by section id, with a single query. A
+        section covers the items that follow it up to the next section."""
+        if not self.ids:
+            return {}
+        self.env['inspection.item'].flush_model(
+            ['inspection_type_id', 'item_type', 'sequence', 'score', 'correct_response'])
+        self.env.cr.execute("""
+            WITH ordered AS (
+                SELECT id, inspection_type_id, item_type, score, correct_response,
+                       count(*) FILTER (WHERE item_type = 'section')
+                           OVER (PARTITION BY inspection_type_id ORDER BY sequence, id) AS section_rank
+                  FROM inspection_item
+                 WHERE inspection_type_id = ANY(%s)
+            )
+            SELECT section.id,
+                   COALESCE(SUM(item.score) FILTER (WHERE item.correct_response), 0),
+                   COALESCE(SUM(item.score), 0)
+              FROM ordered section
+         LEFT JOIN ordered item
+                ON item.inspection_type_id = section.inspection_type_id
+               AND item.section_rank = section.section_rank
+               AND item.item_type = 'item'
+             WHERE section.item_type = 'section'
+          GROUP BY section.id
+        """, [self.ids])
+        return {section_id: (score, max_score) for section_id, score, max_score in self.env.cr.fetchall()}
+
+    def _recompute_scores(self, batch_size=1000):
+        """Recompute the stored scores of the types in ``self`` (all types
+        when empty) batch by batch, e.g. after a mass change of templates."""
+        types = self or self.search([])
+        score_fields = [self._fields[name] for name in ('max_score', 'total_score', 'mandatory_failed_count', 'result')]
+        for start in range(0, len(types), batch_size):
+            batch = types[start:start + batch_size]
+            for field in score_fields:
+                self.env.add_to_compute(field, batch)
+            batch.flush_recordset()
+            batch.invalidate_recordset()
+
+    def _compute_recent_history_ids(self):
+        # the form only shows the latest rows; the whole history is paged
+        # through the history list view
+        History = self.env['inspection.history']
+        for rec in self:
+            rec.recent_history_ids = History.search(
+                [('inspection_type_id', '=', rec.id)], limit=HISTORY_PREVIEW_SIZE,
+            ) if rec.id else History
+
+    def _compute_history_count(self):
+        counts = dict(self.env['inspection.history']._read_group(
+            [('inspection_type_id', 'in', self.ids)], ['inspection_type_id'], ['__count'],
+        ))
+        for rec in self:
+            rec.history_count = counts.get(rec, 0)
+
+    def action_view_history(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('History'),
+            'res_model': 'inspection.history',
+            'view_mode': 'tree',
+            'domain': [('inspection_type_id', '=', self.id)],
+        }
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        unnamed = [vals for vals in vals_list if not vals.get('name')]
+        if unnamed:
+            for vals, name in zip(unnamed, self._reserve_sequence_names(len(unnamed))):
+                vals['name'] = name
+        return super(InspectionType, self).create(vals_list)
+
+    @api.model
+    def _reserve_sequence_names(self, count):
+        """Reserve ``count`` consecutive names from the inspection.type sequence.
+
+        Standard sequences are advanced with a single ``nextval`` call for the
+        whole batch; no-gap and date-range sequences fall back to the regular
+        per-number API.
+        """
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'inspection.type'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [_('New')] * count
+        if sequence.implementation != 'standard' or sequence.use_date_range:
+            return [sequence._next() for __ in range(count)]
+        self.env.cr.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            ['ir_sequence_%03d' % sequence.id, count],
+        )
+        return [sequence.get_next_char(number) for number, in self.env.cr.fetchall()]
+
+    def unlink(self):
+        self.env['inspection.sync.tombstone']._record_deletion(self)
+        return super(InspectionType, self).unlink()
 
     def action_to_approve(self):
         self.write({'state': 'to_approve'})
 
     def action_approve(self):
         self.write({'state': 'approved'})
+        self._invalidate_checklist_template()
 
     def action_reset_draft(self):
+        self._invalidate_checklist_template()
         self.write({'state': 'draft'})
 
     def action_cancel(self):
         self.write({'state': 'cancelled'})
 
+    def _bulk_transition(self, state):
+        """Move the records allowed to reach ``state`` there with one write.
+
+        Field tracking is disabled for the write; instead a single log note
+        on the first record lists the records of the batch, without tracking
+        values nor notifications to followers.
+
+        :return: the records whose state changed
+        """
+        records = self.filtered_domain([('state', 'in', STATE_TRANSITIONS[state])])
+        if not records:
+            return records
+        if state == 'draft':
+            records._invalidate_checklist_template()
+        records.with_context(tracking_disable=True).write({'state': state})
+        if state == 'approved':
+            records._invalidate_checklist_template()
+        label = dict(self._fields['state']._description_selection(self.env))[state]
+        records[0]._message_log(body=_(
+            "Status changed to %(state)s (bulk update) for: %(records)s.",
+            state=label, records=", ".join(records.mapped('display_name')),
+        ))
+        return records
+
+    def action_bulk_to_approve(self):
+        self._bulk_transition('to_approve')
+
+    def action_bulk_approve(self):
+        self._bulk_transition('approved')
+
+    def action_bulk_reset_draft(self):
+        self._bulk_transition('draft')
+
+    def action_bulk_cancel(self):
+        self._bulk_transition('cancelled')
+
+    def _get_checklist_template(self):
+        """Return the compiled checklist of the type: a tuple of
+        ``ChecklistSection`` holding their ``ChecklistItem`` in order. Items
+        placed before the first section belong to a section without id.
+
+        Approved types are compiled once and kept in the ORM cache, keyed by
+        type id and write date; other types are compiled on every call.
+        """
+        self.ensure_one()
+        if self.state != 'approved':
+            return self._compile_checklist_template(self.id)
+        return self._get_cached_checklist_template(self.id, self.write_date)
+
+    @api.model
+    @tools.ormcache('type_id', 'write_date')
+    def _get_cached_checklist_template(self, type_id, write_date):
+        return self._compile_checklist_template(type_id)
+
+    @api.model
+    def _compile_checklist_template(self, type_id):
+        items = self.env['inspection.item'].sudo().search_read(
+            [('inspection_type_id', '=', type_id)],
+            ['name', 'item_type', 'score', 'is_mandatory'],
+            order='sequence, id',
+        )
+        sections = []
+        section, section_items = (False, ''), []
+        for item in items:
+            if item['item_type'] == 'section':
+                if section[0] or section_items:
+                    sections.append(ChecklistSection(*section, tuple(section_items)))
+                section, section_items = (item['id'], item['name']), []
+            else:
+                section_items.append(ChecklistItem(item['id'], item['name'], item['score'], item['is_mandatory']))
+        if section[0] or section_items:
+            sections.append(ChecklistSection(*section, tuple(section_items)))
+        return tuple(sections)
+
+    def _invalidate_checklist_template(self):
+        """Move the write date of the approved types forward, so that their
+        cached templates, keyed by write date, are no longer used. The new
+        date is at least one second later, as the ORM reads write dates
+        without their microseconds."""
+        approved_types = self.filtered(lambda rec: rec.state == 'approved')
+        if not approved_types:
+            return
+        self.flush_model(['write_date'])
+        self.env.cr.execute("""
+            UPDATE inspection_type
+               SET write_date = GREATEST(clock_timestamp() AT TIME ZONE 'UTC', write_date + interval '1 second'),
+                   write_uid = %s
+             WHERE id = ANY(%s)
+        """, [self.env.uid, approved_types.ids])
+        approved_types.invalidate_recordset(['write_date', 'write_uid'])
+
     @api.constrains('inspection_type_name')
     def _check_lenght_inspection_type_name(self):
         for rec in self:
@@ -130,6 +403,12 @@ class InspectionItem(models.Model):
         readonly=True
     )
     response = fields.Char(string="Response")
+    section_score = fields.Float(
+        string="Section Score",
+        compute='_compute_section_score',
+        help="Score of the correctly answered items of the section"
+    )
+    section_max_score = fields.Float(string="Section Maximum Score", compute='_compute_section_score')
     is_mandatory = fields.Boolean(string="Is Mandatory")
     sequence = fields.Integer(string="Sequence", default=10)
     inspection_type_id = fields.Many2one('inspection.type', string="Inspection Type")
@@ -143,23 +422,105 @@ class InspectionItem(models.Model):
         default=False
     )
 
+    def init(self):
+        super().init()
+        # ordered checklist of an inspection type
+        create_index(self.env.cr, 'inspection_item_type_sequence_idx', self._table,
+                     ['inspection_type_id', 'sequence', 'id'])
+        # delta synchronisation cursor
+        create_index(self.env.cr, 'inspection_item_write_date_idx', self._table, ['write_date', 'id'])
+
     @api.depends("display_type")
     def _compute_item_type(self):
         for rec in self:
             if rec.display_type == "line_item":
-                print("is item===>",rec.display_type == "line_item")
                 rec.item_type = "item"
             else:
-                print("is section===>",rec.display_type == "line_section")
                 rec.item_type = "section"
 
+    @api.depends('inspection_type_id.inspection_items.score',
+                 'inspection_type_id.inspection_items.correct_response',
+                 'inspection_type_id.inspection_items.sequence')
+    def _compute_section_score(self):
+        sections = self.filtered(lambda rec: rec.item_type == 'section' and rec.id)
+        subtotals = sections.inspection_type_id._get_section_scores()
+        for rec in self:
+            rec.section_score, rec.section_max_score = subtotals.get(rec.id, (0.0, 0.0))
+
     def create_inspection_history(self, change_description=None):
-        self.env['inspection.history'].create({
-            'user_id': self.env.user.id,
-            'change_date': fields.Datetime.now(),
-            'inspection_type_id': self.inspection_type_id.id,
-            'change_description': change_description
-        })
+        self._create_inspection_history_batch({rec.id: change_description for rec in self})
+
+    def _create_inspection_history_batch(self, descriptions):
+        """Queue the history of several items for the current transaction.
+
+        Events are coalesced per inspection type and user, and written by
+        ``inspection.history`` in a single batch insert right before commit.
+
+        :param dict descriptions: change description keyed by item id
+        """
+        buffer = self.env['inspection.history']._get_history_buffer()
+        for rec in self:
+            if rec.id in descriptions:
+                buffer[(rec.inspection_type_id.id, self.env.uid)].append(descriptions[rec.id])
+
+    def _get_audit_changes(self, values):
+        """Diff ``values`` against the current values of the whole recordset.
+
+        Old values are read once for all records and many2one display names
+        are resolved once per distinct id, so the cost does not depend on the
+        size of the recordset.
+
+        :return: dict of change lines keyed by item id
+        """
+        field_names = [
+            name for name in values
+            if name in self._fields and self._fields[name].type not in ('one2many', 'many2many')
+        ]
+        if not self or not field_names:
+            return {}
+
+        new_values = {}
+        display_names = {}
+        for name in field_names:
+            field = self._fields[name]
+            if field.type == 'many2one':
+                new_values[name] = values[name] or False
+            else:
+                new_values[name] = field.convert_to_cache(values[name], self)
+
+        old_rows = self.read(field_names, load=False)
+
+        for name in field_names:
+            field = self._fields[name]
+            if field.type != 'many2one':
+                continue
+            ids = {row[name] for row in old_rows if row[name]}
+            if new_values[name]:
+                ids.add(new_values[name])
+            comodel = self.env[field.comodel_name]
+            display_names[name] = {
+                record.id: record.display_name for record in comodel.browse(ids).exists()
+            }
+
+        changes = {}
+        for row in old_rows:
+            lines = []
+            for name in field_names:
+                old_val, new_val = row[name], new_values[name]
+                if name in display_names:
+                    if (old_val or False) == new_val:
+                        continue
+                    old_val = display_names[name].get(old_val, "None")
+                    new_val = display_names[name].get(new_val, "None")
+                elif old_val == new_val:
+                    continue
+                lines.append(
+                    f"Field {name} changed from "
+                    f"{old_val} to {new_val}"
+                )
+            if lines:
+                changes[row['id']] = lines
+        return changes
 
     @api.constrains('score')
     def _check_lenght_score(self):
@@ -169,15 +530,19 @@ class InspectionItem(models.Model):
                     _("Score must not exceed 100.")
                 )
 
-    @api.model
-    def create(self, vals):
-        if vals.get('display_type'):
-            vals.update(response=False, is_mandatory=False)
-        record = super().create(vals)
-        record.create_inspection_history(
-            _(f"The Item : {record.name} has been Created.")
-        )
-        return record
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('display_type') != 'line_item':
+                vals.update(response=False, is_mandatory=False)
+        records = super().create(vals_list)
+        # imports log a single line per chunk instead
+        if not self.env.context.get('inspection_item_import'):
+            records._create_inspection_history_batch({
+                rec.id: _("The Item : %s has been Created.", rec.name) for rec in records
+            })
+        records.inspection_type_id._invalidate_checklist_template()
+        return records
 
     def write(self, values):
         if 'display_type' in values and self.filtered(
@@ -187,39 +552,154 @@ class InspectionItem(models.Model):
                 _("You cannot change the type of an inspection item. Instead, you should delete the current item and create a new one of the proper type.")
             )
 
-        for rec in self:
-            changes = []
-            for field_name, new_val in values.items():
-                if field_name in rec._fields:
-                    old_val = rec[field_name]
-                    if rec._fields[field_name].type == "many2one":
-                        old_val = old_val.display_name if old_val else "None"
-                        new_record = rec.env[rec._fields[field_name].comodel_name].browse(new_val)
-                        new_val = new_record.display_name if new_record.exists() else "None"
-                    if old_val != new_val:
-                        changes.append(
-                            f"Field {field_name} changed from "
-                            f"{old_val} to {new_val}"
-                        )
-
-            if changes:
-                rec.create_inspection_history("<br/>".join(changes))
-
-        return super().write(values)
+        changes = self._get_audit_changes(values)
+        if changes:
+            self._create_inspection_history_batch({
+                rec.id: "<br/>".join([_("Item %s:", rec.name)] + changes[rec.id])
+                for rec in self if rec.id in changes
+            })
+
+        inspection_types = self.inspection_type_id
+        res = super().write(values)
+        if TEMPLATE_FIELDS.intersection(values):
+            (inspection_types | self.inspection_type_id)._invalidate_checklist_template()
+        return res
 
     def unlink(self):
-        for rec in self:
-            rec.create_inspection_history(
-                _(f"The Item : {rec.name} has been deleted.")
-            )
-        return super(InspectionItem, self).unlink()
+        self._create_inspection_history_batch({
+            rec.id: _("The Item : %s has been deleted.", rec.name) for rec in self
+        })
+        inspection_types = self.inspection_type_id
+        self.env['inspection.sync.tombstone']._record_deletion(self)
+        res = super(InspectionItem, self).unlink()
+        inspection_types._invalidate_checklist_template()
+        return res
 
 
 class InspectionHistory(models.Model):
     _name = 'inspection.history'
     _description = 'Inspection History'
+    _order = 'change_date desc, id desc'
 
     user_id = fields.Many2one('res.users', string="User", default=lambda self: self.env.user)
-    change_date = fields.Datetime(string="Change Date", default=fields.Datetime.now)
+    change_date = fields.Datetime(string="Change Date", default=fields.Datetime.now, index=True)
     change_description = fields.Text(string="Change Description")
     inspection_type_id = fields.Many2one('inspection.type', string="Inspection Type")
+
+    def _get_history_buffer(self):
+        """Return the history events queued in the current transaction, as
+        lists of descriptions keyed by (inspection type id, user id).
+
+        The buffer lives in the precommit data of the cursor. Entering or
+        releasing a ``cr.savepoint()`` runs the precommit hooks, and rolling
+        it back clears them, so the events of a rolled back savepoint are
+        dropped with it. Savepoints opened with ``flush=False`` do neither:
+        code rolling back such a savepoint after changing items must not
+        rely on the buffer being rolled back too."""
+        precommit = self.env.cr.precommit
+        if HISTORY_BUFFER_KEY not in precommit.data:
+            precommit.data[HISTORY_BUFFER_KEY] = defaultdict(list)
+            precommit.add(self._flush_history_buffer)
+        return precommit.data[HISTORY_BUFFER_KEY]
+
+    def _flush_history_buffer(self):
+        """Write one history row per inspection type and user with all the
+        events queued in the transaction."""
+        buffer = self.env.cr.precommit.data.pop(HISTORY_BUFFER_KEY, None)
+        if not buffer:
+            return
+        type_ids = set(self.env['inspection.type'].browse({type_id for type_id, uid in buffer if type_id}).exists().ids)
+        change_date = fields.Datetime.now()
+        self.sudo().create([{
+            'user_id': uid,
+            'change_date': change_date,
+            'inspection_type_id': type_id if type_id in type_ids else False,
+            'change_description': "<br/>".join(line for line in lines if line) or False,
+        } for (type_id, uid), lines in buffer.items()])
+        self.flush_model()
+
+    def init(self):
+        super().init()
+        # history tab of an inspection type, newest first
+        create_index(self.env.cr, 'inspection_history_type_date_idx', self._table,
+                     ['inspection_type_id', 'change_date DESC', 'id DESC'])
+
+    @api.model
+    def _cron_rollup_history(self, auto_commit=True):
+        """Roll the history older than the retention period up into daily
+        summaries and delete the raw rows, chunk by chunk.
+
+        The retention period (in days) and the chunk size are read from the
+        ``control_inspection_management.history_retention_days`` and
+        ``control_inspection_management.history_rollup_chunk_size`` system
+        parameters.
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        retention_days = int(params.get_param('control_inspection_management.history_retention_days', 365))
+        chunk_size = int(params.get_param('control_inspection_management.history_rollup_chunk_size', 10000))
+        cutoff = fields.Datetime.now() - timedelta(days=retention_days)
+
+        self.env['inspection.history.summary'].flush_model()
+        self.flush_model()
+        cr = self.env.cr
+        while True:
+            cr.execute("""
+                SELECT id
+                  FROM inspection_history
+                 WHERE change_date < %s
+              ORDER BY change_date
+                 LIMIT %s
+            """, [cutoff, chunk_size])
+            history_ids = [row[0] for row in cr.fetchall()]
+            if not history_ids:
+                break
+            self._rollup_history(history_ids)
+            if auto_commit:
+                cr.commit()
+            if len(history_ids) < chunk_size:
+                break
+        self.invalidate_model()
+        self.env['inspection.history.summary'].invalidate_model()
+
+    def _rollup_history(self, history_ids):
+        """Move the given history rows into their daily summaries with a
+        single statement."""
+        self.env.cr.execute("""
+            WITH rolled_up AS (
+                DELETE FROM inspection_history
+                 WHERE id = ANY(%(ids)s)
+             RETURNING inspection_type_id, change_date
+            )
+            INSERT INTO inspection_history_summary
+                   (inspection_type_id, day, change_count, first_change_date, last_change_date,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT inspection_type_id, change_date::date, count(*), min(change_date), max(change_date),
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM rolled_up
+          GROUP BY inspection_type_id, change_date::date
+                ON CONFLICT (COALESCE(inspection_type_id, 0), day) DO UPDATE
+               SET change_count = inspection_history_summary.change_count + EXCLUDED.change_count,
+                   first_change_date = LEAST(inspection_history_summary.first_change_date,
+                                             EXCLUDED.first_change_date),
+                   last_change_date = GREATEST(inspection_history_summary.last_change_date,
+                                               EXCLUDED.last_change_date),
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, {'ids': history_ids, 'uid': self.env.uid})
+
+
+class InspectionHistorySummary(models.Model):
+    _name = 'inspection.history.summary'
+    _description = 'Inspection History Daily Summary'
+    _order = 'day desc, id desc'
+
+    inspection_type_id = fields.Many2one('inspection.type', string="Inspection Type", index=True)
+    day = fields.Date(string="Day", required=True)
+    change_count = fields.Integer(string="Changes")
+    first_change_date = fields.Datetime(string="First Change")
+    last_change_date = fields.Datetime(string="Last Change")
+
+    def init(self):
+        super().init()
+        create_unique_index(self.env.cr, 'inspection_history_summary_type_day_uniq', self._table,
+                            ['COALESCE(inspection_type_id, 0)', 'day'])
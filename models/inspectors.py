@@ -1,5 +1,28 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
 from odoo import fields, models
 
+OPEN_VISIT_STATUSES = ('new', 'in_progress')
+
+
+def _add_busy_period(starts, ends, start, end):
+    """Insert ``[start, end]`` into the sorted, disjoint periods described by
+    the parallel ``starts``/``ends`` lists, merging what it overlaps."""
+    lo = bisect_left(ends, start)
+    hi = bisect_right(starts, end)
+    if lo < hi:
+        start = min(start, starts[lo])
+        end = max(end, ends[hi - 1])
+    starts[lo:hi] = [start]
+    ends[lo:hi] = [end]
+
+
+def _is_busy(starts, ends, start, end):
+    pos = bisect_right(starts, end) - 1
+    return pos >= 0 and ends[pos] >= start
+
+
 class Inspectors(models.Model):
     _name = 'inspection.inspector'
     _description = 'Inspectors'
@@ -13,6 +36,145 @@ class Inspectors(models.Model):
         'hr.department',
         string="Inspector Department",
         related='name.department_id',
+        store=True,
+        index=True,
         readonly=True
     )
-    is_active = fields.Boolean(string="Is Active", default=True)
\ No newline at end of file
+    employee_active = fields.Boolean(
+        string="Employee Active",
+        related='name.active',
+        store=True,
+        index=True,
+        readonly=True
+    )
+    is_active = fields.Boolean(string="Is Active", default=True)
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'name' in vals:
+            self._mark_report_dirty()
+        return res
+
+    def _mark_report_dirty(self):
+        """Queue the report months of the visits of the inspectors, whose
+        rows hold the department of the inspector."""
+        if not self:
+            return
+        months = self.env['inspection.visit'].with_context(active_test=False)._read_group(
+            [('inspector', 'in', self.ids)], ['start_date:month'],
+        )
+        self.env['inspection.visit.report']._mark_dirty([month for month, in months])
+
+    def _get_available_inspectors(self, department=None):
+        domain = [('is_active', '=', True), ('employee_active', '=', True)]
+        if department:
+            domain.append(('department_id', '=', department.id))
+        return self.search(domain)
+
+    def _get_assignment_state(self, date_from, date_to, exclude_visits=None):
+        """Load the open workload and the busy periods of the inspectors in
+        ``self`` between ``date_from`` and ``date_to`` with two queries.
+
+        :return: tuple (visit count per inspector id,
+            (starts, ends) of the merged busy periods per inspector id)
+        """
+        domain = [('inspector', 'in', self.ids), ('status', 'in', OPEN_VISIT_STATUSES)]
+        if exclude_visits:
+            domain.append(('id', 'not in', exclude_visits.ids))
+        Visit = self.env['inspection.visit']
+
+        load = dict.fromkeys(self.ids, 0)
+        for inspector, count in Visit._read_group(domain, ['inspector'], ['__count']):
+            load[inspector.id] = count
+
+        busy = {inspector_id: ([], []) for inspector_id in self.ids}
+        periods = Visit.search_read(
+            domain + [('start_date', '<=', date_to), ('end_date', '>=', date_from)],
+            ['inspector', 'start_date', 'end_date'], order='start_date', load=False,
+        )
+        for period in periods:
+            _add_busy_period(*busy[period['inspector']], period['start_date'], period['end_date'])
+        return load, busy
+
+    def _assign_periods(self, periods, exclude_visits=None):
+        """Distribute visit periods over the inspectors in ``self``.
+
+        Inspectors are kept in a priority queue ordered by workload; each
+        period, taken by start date, goes to the least loaded inspector who
+        is free on those dates. When every inspector is busy the period goes
+        to the least loaded one and is counted as an overlap.
+
+        Consecutive periods often share their dates, as generated visits of
+        the same occurrence do. The inspectors found busy on those dates are
+        kept out of the queue until the dates change, and once all of them
+        are busy the following periods go straight to the least loaded one.
+
+        :param list periods: ``(start_date, end_date)`` tuples
+        :param exclude_visits: visits being reassigned, ignored in the
+            current workload
+        :return: dict with the inspector id of every period (in the order
+            of ``periods``), the resulting load per inspector id and the
+            number of overlapping assignments
+        """
+        result = {'inspector_ids': [False] * len(periods), 'load': {}, 'overlaps': 0}
+        if not self or not periods:
+            return result
+
+        load, busy = self._get_assignment_state(
+            min(start for start, end in periods), max(end for start, end in periods),
+            exclude_visits=exclude_visits,
+        )
+        heap = [(count, inspector_id) for inspector_id, count in load.items()]
+        heapq.heapify(heap)
+        # inspectors busy on the current dates, out of the queue
+        parked = []
+        saturated = False
+        current_dates = None
+
+        for index in sorted(range(len(periods)), key=lambda i: periods[i]):
+            start, end = periods[index]
+            if (start, end) != current_dates:
+                current_dates = (start, end)
+                if parked:
+                    heap.extend(parked)
+                    heapq.heapify(heap)
+                    parked = []
+                saturated = False
+            chosen = None
+            while not saturated and heap:
+                entry = heapq.heappop(heap)
+                if not _is_busy(*busy[entry[1]], start, end):
+                    chosen = entry
+                    break
+                parked.append(entry)
+            if chosen is None:
+                if not saturated:
+                    # every inspector is busy on these dates, and stays so
+                    # for the following periods on the same dates
+                    heap, parked = parked, []
+                    heapq.heapify(heap)
+                    saturated = True
+                chosen = heapq.heappop(heap)
+                result['overlaps'] += 1
+
+            count, inspector_id = chosen
+            _add_busy_period(*busy[inspector_id], start, end)
+            load[inspector_id] = count + 1
+            result['inspector_ids'][index] = inspector_id
+            if saturated:
+                heapq.heappush(heap, (count + 1, inspector_id))
+            else:
+                parked.append((count + 1, inspector_id))
+
+        result['load'] = load
+        return result
+
+
+class HrEmployee(models.Model):
+    _inherit = 'hr.employee'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'department_id' in vals:
+            self.env['inspection.inspector'].search([('name', 'in', self.ids)])._mark_report_dirty()
+        return res
@@ -0,0 +1,194 @@
+import csv
+import io
+import logging
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = ['name', 'display_type', 'sequence', 'is_mandatory', 'response', 'correct_response', 'score']
+IMPORT_CHUNK_SIZE = 1000
+# number of rejected rows kept in the error log
+IMPORT_MAX_ERRORS = 1000
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+
+
+class InspectionItemImport(models.Model):
+    """Resumable import of a large checklist file into an inspection type.
+
+    The file is parsed as a stream and its rows are validated and inserted
+    chunk by chunk. Every chunk is committed together with the byte offset
+    of the next row, so an interrupted import resumes where it stopped
+    without creating any item twice.
+    """
+    _name = 'inspection.item.import'
+    _description = 'Inspection Checklist Import'
+    _order = 'id desc'
+    _rec_name = 'file_name'
+
+    inspection_type_id = fields.Many2one('inspection.type', string="Inspection Type", required=True,
+                                         ondelete='cascade')
+    import_file = fields.Binary(string="File", required=True, attachment=True)
+    file_name = fields.Char(string="File Name")
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string="Status", default='draft', required=True, readonly=True)
+    chunk_size = fields.Integer(string="Chunk Size", default=IMPORT_CHUNK_SIZE, required=True)
+    checkpoint = fields.Integer(string="Checkpoint", readonly=True,
+                                help="Byte offset of the next row to import")
+    checkpoint_line = fields.Integer(string="Checkpoint Line", readonly=True,
+                                     help="Number of file lines before the checkpoint")
+    imported_count = fields.Integer(string="Imported Items", readonly=True)
+    error_count = fields.Integer(string="Rejected Rows", readonly=True)
+    error_log = fields.Text(string="Errors", readonly=True)
+
+    def _open_file(self):
+        """Return a binary file object on the stored file, read from the
+        filestore rather than loaded in memory when possible."""
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'import_file'),
+            ('res_id', '=', self.id),
+        ], limit=1)
+        if not attachment:
+            raise UserError(_("The import %s has no file.", self.display_name))
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        return io.BytesIO(attachment.raw)
+
+    @api.model
+    def _iter_rows(self, fileobj, offset=0, line_offset=0):
+        """Yield ``(line, row, next_offset)`` for the rows of ``fileobj``
+        starting at byte ``offset``, preceded by ``line_offset`` lines;
+        ``row`` maps the header columns to the raw values and
+        ``next_offset`` is where the following row starts."""
+        header = next(csv.reader([fileobj.readline().decode('utf-8-sig')]), [])
+        header = [column.strip().lower() for column in header]
+        if 'name' not in header:
+            raise UserError(_("The file must have a header line with a 'name' column."))
+        if offset <= fileobj.tell():
+            offset, line_offset = fileobj.tell(), 1
+        fileobj.seek(offset)
+        position = [fileobj.tell()]
+
+        def lines():
+            for line in iter(fileobj.readline, b''):
+                position[0] = fileobj.tell()
+                yield line.decode('utf-8')
+
+        reader = csv.reader(lines())
+        for row in reader:
+            if any(value.strip() for value in row):
+                yield line_offset + reader.line_num, dict(zip(header, row)), position[0]
+
+    @api.model
+    def _prepare_item_values(self, row):
+        """Validate one parsed row, return ``(values, error)``."""
+        name = (row.get('name') or '').strip()
+        if not name:
+            return None, _("the item name is missing")
+        # rows without a display type are checklist items, not sections
+        display_type = (row.get('display_type') or '').strip() or 'line_item'
+        if display_type not in ('line_item', 'line_section'):
+            return None, _("unknown display type %s", display_type)
+        try:
+            score = float(row.get('score') or 0)
+            sequence = int(row['sequence']) if (row.get('sequence') or '').strip() else None
+        except ValueError:
+            return None, _("the score or the sequence is not a number")
+        # same rule as _check_lenght_score, checked before the insert
+        if score > 100:
+            return None, _("Score must not exceed 100.")
+        values = {
+            'name': name,
+            'display_type': display_type,
+            'is_mandatory': (row.get('is_mandatory') or '').strip().lower() in TRUE_VALUES,
+            'response': (row.get('response') or '').strip() or False,
+            'correct_response': (row.get('correct_response') or '').strip().lower() in TRUE_VALUES,
+            'score': score,
+        }
+        if sequence is not None:
+            values['sequence'] = sequence
+        return values, None
+
+    def _import_chunk(self, rows):
+        """Insert one validated chunk and move the checkpoint past it."""
+        vals_list, errors = [], []
+        for line, row, __ in rows:
+            values, error = self._prepare_item_values(row)
+            if error:
+                errors.append(_("Line %(line)s: %(error)s", line=line, error=error))
+                continue
+            # rows without a sequence keep their order in the file
+            values.setdefault('sequence', line)
+            values['inspection_type_id'] = self.inspection_type_id.id
+            vals_list.append(values)
+        items = self.env['inspection.item'].with_context(inspection_item_import=True).create(vals_list)
+        if items:
+            buffer = self.env['inspection.history']._get_history_buffer()
+            buffer[(self.inspection_type_id.id, self.env.uid)].append(
+                _("%(count)s items have been imported from %(file)s.", count=len(items), file=self.file_name or '')
+            )
+        logged_errors = (self.error_log or '').splitlines()
+        logged_errors += errors[:max(IMPORT_MAX_ERRORS - len(logged_errors), 0)]
+        self.write({
+            'checkpoint': rows[-1][2],
+            'checkpoint_line': rows[-1][0],
+            'imported_count': self.imported_count + len(items),
+            'error_count': self.error_count + len(errors),
+            'error_log': '\n'.join(logged_errors) or False,
+        })
+
+    def _run(self, auto_commit=True):
+        """Import the remaining rows, committing every chunk with its
+        checkpoint."""
+        self.ensure_one()
+        try:
+            with self._open_file() as fileobj:
+                rows = []
+                for parsed in self._iter_rows(fileobj, self.checkpoint, self.checkpoint_line):
+                    rows.append(parsed)
+                    if len(rows) >= self.chunk_size:
+                        with self.env.cr.savepoint():
+                            self._import_chunk(rows)
+                        rows = []
+                        if auto_commit:
+                            self.env.cr.commit()
+                if rows:
+                    with self.env.cr.savepoint():
+                        self._import_chunk(rows)
+        except (UserError, ValueError, csv.Error) as error:
+            self._mark_failed(error)
+        else:
+            self.state = 'done'
+        if auto_commit:
+            self.env.cr.commit()
+
+    def _mark_failed(self, error):
+        self.write({'state': 'failed', 'error_log': '\n'.join(filter(None, [self.error_log, str(error)]))})
+
+    def action_start(self):
+        """Start the import, or resume it from its checkpoint after a failure."""
+        self.filtered(lambda rec: rec.state in ('draft', 'failed')).write({'state': 'running'})
+        self.env.ref('control_inspection_management.ir_cron_inspection_item_import')._trigger()
+
+    @api.model
+    def _cron_run_imports(self, auto_commit=True):
+        """Run, or resume after an interruption, the pending imports. A job
+        failing unexpectedly is marked as failed without stopping the
+        following ones."""
+        for job in self.search([('state', '=', 'running')], order='id'):
+            _logger.info("Importing checklist %s from row offset %s", job.display_name, job.checkpoint)
+            try:
+                job._run(auto_commit=auto_commit)
+            except Exception as error:
+                _logger.exception("Checklist import %s failed", job.display_name)
+                if auto_commit:
+                    self.env.cr.rollback()
+                job._mark_failed(error)
+                if auto_commit:
+                    self.env.cr.commit()
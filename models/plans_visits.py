@@ -1,12 +1,45 @@
-from odoo import models, fields, api,_
+from odoo import models, fields, api, tools,_, _lt
 from odoo.exceptions import ValidationError,UserError
-from datetime import datetime
-import re
+from odoo.osv import expression
+from odoo.tools import SQL
+from odoo.tools.sql import create_index, drop_index, index_exists
+from .validation import TARGET_ENTITY_PATTERN
+from .visit_report import REPORT_FIELDS
+from collections import defaultdict
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+import logging
+import psycopg2
+
+_logger = logging.getLogger(__name__)
+
+# allowed source statuses of every visit status
+VISIT_TRANSITIONS = {
+    'in_progress': ('new',),
+    'completed': ('in_progress',),
+    'submitted': ('completed',),
+}
+# fields that can still be written once a visit has started
+VISIT_UNLOCKED_FIELDS = {'status', 'active'}
+
+# text indexed for the similarity ordering of the visit picker
+SEARCH_EXPRESSION = "name || ' ' || target_entity"
+
+# relativedelta unit of every recurrence frequency
+RECURRENCE_FREQUENCIES = {
+    'daily': 'days',
+    'weekly': 'weeks',
+    'monthly': 'months',
+}
 
 
 class InspectionPlan(models.Model):
     _name = 'inspection.plan'
     _description = 'Inspection Plan'
+    _inherit = ['inspection.validation.mixin']
+    _inspection_field_rules = {
+        'name': {'label': _lt('Plan Name'), 'max_length': 250},
+    }
 
     name = fields.Char(string='Plan Name', required=True,translate=True,
         size=250)
@@ -25,8 +58,20 @@ class InspectionPlan(models.Model):
         string='Attachments',
         help="Attachments"
     )
+    active = fields.Boolean(string='Active', default=True)
+    completion_date = fields.Datetime(string='Completed On', readonly=True, copy=False)
     planned_visits_ids = fields.One2many('inspection.visit', 'plan_id', string='Planned Visits')
-    visits_count = fields.Integer(compute='_compute_visits_count', string='Visits Count')
+    visits_count = fields.Integer(compute='_compute_visits_count', string='Visits Count', store=True)
+    visits_new_count = fields.Integer(compute='_compute_visits_count', string='New Visits', store=True)
+    visits_in_progress_count = fields.Integer(compute='_compute_visits_count', string='Visits In Progress', store=True)
+    visits_completed_count = fields.Integer(compute='_compute_visits_count', string='Completed Visits', store=True)
+    visits_submitted_count = fields.Integer(compute='_compute_visits_count', string='Submitted Visits', store=True)
+
+    def init(self):
+        super().init()
+        # completed plans waiting to be archived
+        create_index(self.env.cr, 'inspection_plan_archive_idx', self._table,
+                     ['completion_date'], where="active AND status = 'completed'")
 
     @api.constrains('start_date')
     def _check_start_date_today(self):
@@ -34,39 +79,212 @@ class InspectionPlan(models.Model):
             if record.start_date and record.start_date < fields.Date.today():
                 raise ValidationError(_("Start Date must be greater than or equal to today's date."))
 
-    @api.constrains('start_date', 'end_date')
-    def _check_date_order(self):
-        for record in self:
-            if record.start_date and record.end_date and record.start_date > record.end_date:
-                raise ValidationError(_("End Date must be greater than or equal to Start Date."))
+    @api.constrains('name', 'start_date', 'end_date', 'attachment_ids')
+    def _check_inspection_rules(self):
+        self._validate_inspection_rules()
 
-    @api.constrains('attachment_ids')
-    def _check_attachment_type(self):
-        for record in self:
-            for attachment in record.attachment_ids:
-                if attachment.mimetype not in ['application/pdf', 'application/msword', 'image/jpeg', 'image/png']:
-                    raise ValidationError(_("Invalid file type. Please upload a PDF, Word, or Image file."))
+    @api.depends('planned_visits_ids.status')
+    def _compute_visits_count(self):
+        """Count visits per status with a single grouped query for all stored
+        plans; plans being edited in a form are counted from their lines."""
+        counts = defaultdict(lambda: defaultdict(int))
+        stored_plans = self.filtered('id')
+        if stored_plans:
+            # archived plans keep counting their archived visits
+            for plan, status, count in self.env['inspection.visit'].with_context(active_test=False)._read_group(
+                    [('plan_id', 'in', stored_plans.ids)], ['plan_id', 'status'], ['__count']):
+                counts[plan.id][status] = count
+        for plan in self - stored_plans:
+            for visit in plan.planned_visits_ids:
+                counts[plan.id][visit.status] += 1
 
-    @api.constrains('planned_visits_ids')
-    def _check_unique_visit_name(self):
-        for record in self:
-            visit_names = [visit.name for visit in record.planned_visits_ids]
-            if len(visit_names) != len(set(visit_names)):
-                raise ValidationError(
-                    'An inspection visit with the same name already exists. Please use a unique name.')
+        for plan in self:
+            plan_counts = counts[plan.id]
+            plan.visits_count = sum(plan_counts.values())
+            plan.visits_new_count = plan_counts['new']
+            plan.visits_in_progress_count = plan_counts['in_progress']
+            plan.visits_completed_count = plan_counts['completed']
+            plan.visits_submitted_count = plan_counts['submitted']
 
+    @api.model
+    def _update_completion_status(self, plan_ids=None):
+        """Set plans whose visits are all submitted to completed, and the
+        other plans back to draft, with a single UPDATE.
 
-    @api.constrains('planned_visits_ids')
-    def _check_unique_visit_name(self):
-        for record in self:
-            visit_names = [visit.name for visit in record.planned_visits_ids]
-            if len(visit_names) != len(set(visit_names)):
-                raise ValidationError(
-                    'An inspection visit with the same name already exists. Please use a unique name.')
+        :param list plan_ids: plans to check; all active plans when ``None``
+        """
+        if plan_ids is not None and not plan_ids:
+            return
+        self.env['inspection.visit'].flush_model(['plan_id', 'status'])
+        self.flush_model(['status'])
+        query = """
+            WITH expected AS (
+                SELECT plan.id,
+                       CASE WHEN EXISTS (SELECT 1 FROM inspection_visit visit WHERE visit.plan_id = plan.id)
+                             AND NOT EXISTS (SELECT 1 FROM inspection_visit visit
+                                              WHERE visit.plan_id = plan.id AND visit.status != 'submitted')
+                            THEN 'completed' ELSE 'draft' END AS status
+                  FROM inspection_plan plan
+                 {where}
+            )
+            UPDATE inspection_plan plan
+               SET status = expected.status,
+                   completion_date = CASE WHEN expected.status = 'completed'
+                                          THEN now() AT TIME ZONE 'UTC' END,
+                   write_uid = %(uid)s,
+                   write_date = now() AT TIME ZONE 'UTC'
+              FROM expected
+             WHERE expected.id = plan.id
+               AND plan.status IS DISTINCT FROM expected.status
+         RETURNING plan.id
+        """.format(where="WHERE plan.id = ANY(%(ids)s)" if plan_ids is not None else "WHERE plan.active")
+        self.env.cr.execute(query, {'ids': list(plan_ids or []), 'uid': self.env.uid})
+        updated_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.browse(updated_ids).invalidate_recordset(['status', 'completion_date', 'write_uid', 'write_date'])
+        return updated_ids
 
-    def _compute_visits_count(self):
-        for plan in self:
-            plan.visits_count = len(plan.planned_visits_ids)
+    @api.model
+    def _cron_reconcile_completion_status(self):
+        updated_ids = self._update_completion_status()
+        if updated_ids:
+            _logger.info("Repaired the completion status of %s inspection plans.", len(updated_ids))
+
+    def _get_recurrence_dates(self, frequency, interval=1):
+        """Return the visit dates of the recurrence inside the plan window.
+
+        Every date is computed from the start date, so that a monthly visit
+        on the 31st falls on the last day of the shorter months instead of
+        skipping them.
+        """
+        self.ensure_one()
+        dates = []
+        step = 0
+        while True:
+            visit_date = self.start_date + relativedelta(**{RECURRENCE_FREQUENCIES[frequency]: step * interval})
+            if visit_date > self.end_date:
+                return dates
+            dates.append(visit_date)
+            step += 1
+
+    def _prepare_recurring_visits(self, target_entities, frequency, interval=1, duration=1, inspector=None):
+        """Build the values of the visits of a recurrence.
+
+        The names already used in the plan are read once; a generated visit
+        whose name is already taken, or whose values break the field rules
+        of visits, is reported as a conflict instead of being created.
+
+        :return: tuple (list of visit values, list of conflicting names)
+        """
+        self.ensure_one()
+        existing_names = {
+            visit['name'] for visit in
+            self.env['inspection.visit'].search_read([('plan_id', '=', self.id)], ['name'])
+        }
+        Visit = self.env['inspection.visit']
+        vals_list = []
+        conflicts = []
+        for visit_date in self._get_recurrence_dates(frequency, interval):
+            end_date = min(visit_date + timedelta(days=duration - 1), self.end_date)
+            for entity in target_entities:
+                name = f"{entity} - {fields.Date.to_string(visit_date)}"
+                if name in existing_names:
+                    conflicts.append(name)
+                    continue
+                messages = Visit._check_field_rules({'name': name, 'target_entity': entity})
+                if messages:
+                    conflicts.append(f"{name}: {'; '.join(messages)}")
+                    continue
+                existing_names.add(name)
+                vals_list.append({
+                    'name': name,
+                    'target_entity': entity,
+                    'start_date': visit_date,
+                    'end_date': end_date,
+                    'plan_id': self.id,
+                    'inspector': inspector.id if inspector else False,
+                })
+        return vals_list, conflicts
+
+    def generate_recurring_visits(self, target_entities, frequency, interval=1, duration=1,
+                                  inspector=None, department=None, dry_run=False):
+        """Create the visits of the plan for every target entity and every
+        occurrence of the recurrence, in one batch.
+
+        :param list target_entities: names of the entities to visit
+        :param str frequency: one of ``daily``, ``weekly`` or ``monthly``
+        :param int interval: number of periods between two visits
+        :param int duration: length of a visit in days
+        :param inspector: ``inspection.inspector`` record assigned to the
+            visits; when empty, the visits are distributed over the active
+            inspectors
+        :param department: ``hr.department`` record restricting the
+            inspectors used for the automatic assignment
+        :param bool dry_run: only report what would be created
+        :return: dict with the number of visits, the conflicting names, the
+            resulting load per inspector id and the created visits
+        """
+        self.ensure_one()
+        if interval < 1 or duration < 1:
+            raise UserError(_("Repeat interval and visit duration must be at least 1."))
+        vals_list, conflicts = self._prepare_recurring_visits(
+            target_entities, frequency, interval=interval, duration=duration, inspector=inspector,
+        )
+        load = {}
+        if not inspector and vals_list:
+            assignment = self.env['inspection.visit']._assign_inspectors(vals_list, department=department)
+            load = assignment['load']
+        visits = self.env['inspection.visit']
+        if not dry_run and vals_list:
+            visits = visits.create(vals_list)
+        return {
+            'visit_count': len(vals_list),
+            'conflicts': conflicts,
+            'load': load,
+            'visits': visits,
+        }
+
+    def action_generate_visits(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Generate Visits'),
+            'res_model': 'inspection.visit.generate',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {'default_plan_id': self.id},
+        }
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'active' in vals:
+            # visits are archived and restored with their plan
+            visits = self.with_context(active_test=False).planned_visits_ids
+            visits.filtered(lambda visit: visit.active != vals['active']).write({'active': vals['active']})
+        return res
+
+    @api.model
+    def _cron_archive_completed_plans(self, auto_commit=True):
+        """Archive the plans completed for longer than the retention
+        period, with their visits, batch by batch."""
+        params = self.env['ir.config_parameter'].sudo()
+        archive_days = int(params.get_param('control_inspection_management.plan_archive_days', 180))
+        batch_size = int(params.get_param('control_inspection_management.plan_archive_batch_size', 500))
+        cutoff = fields.Datetime.now() - timedelta(days=archive_days)
+        domain = [('status', '=', 'completed'), ('completion_date', '<', cutoff)]
+        archived_count = 0
+        while True:
+            plans = self.search(domain, order='completion_date, id', limit=batch_size)
+            if not plans:
+                break
+            plans.write({'active': False})
+            archived_count += len(plans)
+            if auto_commit:
+                self.env.cr.commit()
+            if len(plans) < batch_size:
+                break
+        if archived_count:
+            _logger.info("Archived %s completed inspection plans.", archived_count)
+        return archived_count
 
     def action_view_visits(self):
         self.ensure_one()
@@ -83,6 +301,15 @@ class InspectionPlan(models.Model):
 class InspectionVisit(models.Model):
     _name = 'inspection.visit'
     _description = 'Inspection Visit'
+    _inherit = ['inspection.validation.mixin']
+    _inspection_field_rules = {
+        'name': {'label': _lt('Title'), 'max_length': 250},
+        'target_entity': {'label': _lt('Target Entity'), 'pattern': TARGET_ENTITY_PATTERN},
+    }
+    _sql_constraints = [
+        ('plan_name_unique', 'unique(plan_id, name)',
+         'An inspection visit with the same name already exists in this plan. Please use a unique name.'),
+    ]
 
     name = fields.Char(string='Title', required=True,size=250)
     target_entity = fields.Char(string='Target Entity', required=True)
@@ -94,23 +321,210 @@ class InspectionVisit(models.Model):
         ('completed', 'Completed'),
         ('submitted', 'Submitted'),
     ], string='Status', default='new')
-    plan_id = fields.Many2one('inspection.plan', string='Inspection Plan', required=True)
+    plan_id = fields.Many2one('inspection.plan', string='Inspection Plan', required=True, index=True)
     attachment_ids = fields.Many2many('ir.attachment', string='Attachments')
 
     inspector = fields.Many2one(
         'inspection.inspector',
         string="Inspector",
-        required=True
+        required=True,
+        index=True
+    )
+    active = fields.Boolean(string='Active', default=True)
+    conflicting_visit_ids = fields.Many2many(
+        'inspection.visit',
+        compute='_compute_conflicting_visit_ids',
+        string="Conflicting Visits",
+        help="Other visits of the same inspector overlapping these dates"
     )
 
+    def init(self):
+        super().init()
+        # superseded by the indexes restricted to active visits
+        for index_name in ('inspection_visit_open_inspector_idx', 'inspection_visit_unsubmitted_plan_idx',
+                           'inspection_visit_inspector_period_idx'):
+            drop_index(self.env.cr, index_name, self._table)
+        # open workload of an inspector, used by the assignment engine
+        create_index(self.env.cr, 'inspection_visit_active_open_inspector_idx', self._table,
+                     ['inspector', 'start_date'], where="active AND status IN ('new', 'in_progress')")
+        # visits of a plan that still need work
+        create_index(self.env.cr, 'inspection_visit_active_unsubmitted_plan_idx', self._table,
+                     ['plan_id', 'status'], where="active AND status != 'submitted'")
+        # delta synchronisation cursor
+        create_index(self.env.cr, 'inspection_visit_write_date_idx', self._table, ['write_date', 'id'])
+        self._create_inspector_period_index()
+        self._create_trigram_indexes()
+
+    def _create_trigram_indexes(self):
+        """Trigram indexes of the visit title and target entity: GIN indexes
+        serving ``ilike '%...%'`` searches on each column, and a GiST index on
+        both, walked in similarity order by :meth:`_name_search`. They need
+        the pg_trgm extension; without it these searches keep working with
+        sequential scans."""
+        cr = self.env.cr
+        try:
+            with cr.savepoint(flush=False):
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except psycopg2.Error:
+            _logger.info("pg_trgm is not available, inspection visits are searched without trigram indexes")
+            return
+        for column in ('name', 'target_entity'):
+            create_index(cr, f'inspection_visit_{column}_trgm_idx', self._table,
+                         [f'({column}) gin_trgm_ops'], method='gin')
+        create_index(cr, 'inspection_visit_search_trgm_idx', self._table,
+                     [f'({SEARCH_EXPRESSION}) gist_trgm_ops'], method='gist')
+        self.env.registry.clear_cache()
+
+    @api.model
+    @tools.ormcache()
+    def _has_trigram(self):
+        self.env.cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _name_search(self, name, domain=None, operator='ilike', limit=None, order=None):
+        """Match the title or the target entity in one query. With pg_trgm
+        and the default order, the best matches come first: the rows are
+        ordered by word similarity distance (``<<->``) to the title and
+        entity, which the GiST trigram index returns nearest first, so that
+        pickers read only their top ``limit`` visits."""
+        if not name or operator != 'ilike':
+            return super()._name_search(name, domain=domain, operator=operator, limit=limit, order=order)
+        domain = expression.AND([
+            domain or [],
+            ['|', ('name', 'ilike', name), ('target_entity', 'ilike', name)],
+        ])
+        query = self._search(domain, limit=limit, order=order)
+        # name_search() passes the default order explicitly
+        if order in (None, self._order) and self._has_trigram():
+            query.order = SQL(
+                "%s <<-> (%s || ' ' || %s), %s",
+                name,
+                SQL.identifier(query.table, 'name'),
+                SQL.identifier(query.table, 'target_entity'),
+                SQL.identifier(query.table, 'id'),
+            )
+        return query
+
+    def _create_inspector_period_index(self):
+        """GiST index over the inspector and the period of the active visits,
+        used to find double bookings. Indexing the inspector column in a GiST
+        index needs the btree_gist extension; without it only the period is
+        indexed."""
+        cr = self.env.cr
+        if index_exists(cr, 'inspection_visit_active_inspector_period_idx'):
+            return
+        expressions = ['inspector', "daterange(start_date, end_date, '[]')"]
+        try:
+            with cr.savepoint(flush=False):
+                cr.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        except psycopg2.Error:
+            _logger.info("btree_gist is not available, indexing inspection visit periods without the inspector")
+            expressions = expressions[1:]
+        create_index(cr, 'inspection_visit_active_inspector_period_idx', self._table, expressions,
+                     method='gist', where='active')
+
+    @api.model
+    def _find_inspector_conflicts(self, periods):
+        """Find the stored visits overlapping a list of inspector periods with
+        a single query.
+
+        :param list periods: ``(inspector_id, start_date, end_date, visit_id)``
+            tuples; ``visit_id`` is the visit the period belongs to, if any,
+            so that it does not conflict with itself
+        :return: list of sets of conflicting visit ids, in the order of
+            ``periods``
+        """
+        conflicts = [set() for __ in periods]
+        periods = [
+            (index, inspector_id, start_date, end_date, visit_id or None)
+            for index, (inspector_id, start_date, end_date, visit_id) in enumerate(periods)
+            if inspector_id and start_date and end_date
+        ]
+        if not periods:
+            return conflicts
+        self.flush_model(['inspector', 'start_date', 'end_date', 'active'])
+        self.env.cr.execute("""
+            SELECT candidate.key, visit.id
+              FROM unnest(%s::int[], %s::int[], %s::date[], %s::date[], %s::int[])
+                   AS candidate(key, inspector, start_date, end_date, visit_id)
+              JOIN inspection_visit visit
+                ON visit.inspector = candidate.inspector
+               AND daterange(visit.start_date, visit.end_date, '[]')
+                   && daterange(candidate.start_date, candidate.end_date, '[]')
+               AND visit.id IS DISTINCT FROM candidate.visit_id
+               AND visit.active
+        """, [list(column) for column in zip(*periods)])
+        for key, visit_id in self.env.cr.fetchall():
+            conflicts[key].add(visit_id)
+        return conflicts
+
+    def _get_inspector_conflicts(self):
+        """Return the visits overlapping each visit of ``self`` for the same
+        inspector, as a dict mapping visits to recordsets."""
+        conflicts = self._find_inspector_conflicts([
+            (visit.inspector.id, visit.start_date, visit.end_date, visit._origin.id)
+            for visit in self
+        ])
+        return {visit: self.browse(visit_ids) for visit, visit_ids in zip(self, conflicts)}
+
+    @api.depends('inspector', 'start_date', 'end_date')
+    def _compute_conflicting_visit_ids(self):
+        for visit, conflicting_visits in self._get_inspector_conflicts().items():
+            visit.conflicting_visit_ids = conflicting_visits
+
     def write(self, vals):
         """
         Override the write method to restrict editing if the status is not 'Scheduled'.
+        Status changes are always allowed, transitions are checked by _change_status.
         """
-        for visit in self:
-            if visit.status != 'new':
-                raise UserError("You cannot edit a visit that is not in 'Scheduled' status.")
-        return super(InspectionVisit, self).write(vals)
+        if not VISIT_UNLOCKED_FIELDS.issuperset(vals) and self.filtered_domain([('status', '!=', 'new')]):
+            raise UserError("You cannot edit a visit that is not in 'Scheduled' status.")
+        plans = self.plan_id
+        report_dates = self.mapped('start_date') if REPORT_FIELDS.intersection(vals) else []
+        res = super(InspectionVisit, self).write(vals)
+        if 'attachment_ids' in vals:
+            self._deduplicate_attachments()
+        if 'status' in vals or 'plan_id' in vals:
+            self.env['inspection.plan']._update_completion_status((plans | self.plan_id).ids)
+        if report_dates:
+            self.env['inspection.visit.report']._mark_dirty(report_dates + self.mapped('start_date'))
+        return res
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        visits = super().create(vals_list)
+        visits.filtered('attachment_ids')._deduplicate_attachments()
+        self.env['inspection.plan']._update_completion_status(visits.plan_id.ids)
+        self.env['inspection.visit.report']._mark_dirty(visits.mapped('start_date'))
+        return visits
+
+    def _change_status(self, status):
+        """Move the whole recordset to ``status``.
+
+        The allowed source states are checked with one domain query and the
+        change is applied with one write, whatever the number of visits.
+        """
+        sources = VISIT_TRANSITIONS[status]
+        invalid_visits = self.with_context(active_test=False).search(
+            [('id', 'in', self.ids), ('status', 'not in', sources)])
+        if invalid_visits:
+            raise UserError(_(
+                "The following visits cannot be moved to %(status)s:\n%(visits)s",
+                status=dict(self._fields['status']._description_selection(self.env))[status],
+                visits="\n".join(invalid_visits[:20].mapped('name')),
+            ))
+        self.write({'status': status})
+        return True
+
+    def action_start(self):
+        return self._change_status('in_progress')
+
+    def action_complete(self):
+        return self._change_status('completed')
+
+    def action_submit(self):
+        return self._change_status('submitted')
 
     def unlink(self):
         """
@@ -119,7 +533,75 @@ class InspectionVisit(models.Model):
         for visit in self:
             if visit.status != 'new':
                 raise UserError("You cannot delete a visit that is not in 'Scheduled' status.")
-        return super(InspectionVisit, self).unlink()
+        plans = self.plan_id
+        report_dates = self.mapped('start_date')
+        self.env['inspection.sync.tombstone']._record_deletion(self)
+        self._release_shared_attachments()
+        res = super(InspectionVisit, self).unlink()
+        self.env['inspection.plan']._update_completion_status(plans.ids)
+        self.env['inspection.visit.report']._mark_dirty(report_dates)
+        return res
+
+    @api.model
+    def _assign_inspectors(self, vals_list, department=None, exclude_visits=None):
+        """Set the inspector of the visit values in ``vals_list`` with the
+        load-balancing engine of ``inspection.inspector``."""
+        inspectors = self.env['inspection.inspector']._get_available_inspectors(department)
+        if not inspectors:
+            raise UserError(_("There is no active inspector to assign the visits to."))
+        assignment = inspectors._assign_periods(
+            [(vals['start_date'], vals['end_date']) for vals in vals_list],
+            exclude_visits=exclude_visits,
+        )
+        for vals, inspector_id in zip(vals_list, assignment['inspector_ids']):
+            vals['inspector'] = inspector_id
+        return assignment
+
+    def _auto_assign_inspectors(self, by_department=False):
+        """Rebalance the new visits of ``self`` over the active inspectors,
+        optionally keeping each visit within the department of its current
+        inspector. Visits are written once per inspector.
+
+        :return: dict with the resulting load per inspector id and the
+            number of overlapping assignments
+        """
+        visits = self.filtered(lambda visit: visit.status == 'new')
+        groups = visits.grouped(lambda visit: visit.inspector.department_id) if by_department else {None: visits}
+        report = {'load': {}, 'overlaps': 0}
+        for department, department_visits in groups.items():
+            vals_list = [
+                {'start_date': visit.start_date, 'end_date': visit.end_date}
+                for visit in department_visits
+            ]
+            assignment = self._assign_inspectors(vals_list, department=department, exclude_visits=department_visits)
+            report['load'].update(assignment['load'])
+            report['overlaps'] += assignment['overlaps']
+
+            visits_by_inspector = defaultdict(list)
+            for visit, vals in zip(department_visits, vals_list):
+                if visit.inspector.id != vals['inspector']:
+                    visits_by_inspector[vals['inspector']].append(visit.id)
+            for inspector_id, visit_ids in visits_by_inspector.items():
+                self.browse(visit_ids).write({'inspector': inspector_id})
+        return report
+
+    def action_auto_assign_inspectors(self):
+        report = self._auto_assign_inspectors()
+        inspectors = self.env['inspection.inspector'].browse(list(report['load']))
+        message = "\n".join(
+            f"{inspector.display_name}: {report['load'][inspector.id]}" for inspector in inspectors
+        )
+        if report['overlaps']:
+            message += "\n" + _("%s visits overlap another visit of their inspector.", report['overlaps'])
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Inspector Workload"),
+                'message': message,
+                'sticky': True,
+            },
+        }
 
     def action_open_inspection_plan(self):
         """
@@ -134,78 +616,6 @@ class InspectionVisit(models.Model):
             'target': 'current',
         }
 
-    @api.constrains('name')
-    def _check_name_length(self):
-        for record in self:
-            if len(record.name) > 250:
-                raise ValidationError(f"The {record.name} field cannot exceed 250 characters.")
-
-    @api.constrains('start_date', 'end_date')
-    def _check_date_order(self):
-        for record in self:
-            if record.start_date and record.end_date and record.start_date > record.end_date:
-                raise ValidationError("End Date must be greater than or equal to Start Date.")
-
-    @api.constrains('attachment_ids')
-    def _check_attachment_type(self):
-        for record in self:
-            for attachment in record.attachment_ids:
-                if attachment.mimetype not in ['application/pdf', 'application/msword', 'image/jpeg', 'image/png']:
-                    raise ValidationError("Invalid file type. Please upload a PDF, Word, or Image file.")
-
-    @api.constrains('attachment_ids')
-    def _check_attachment_size(self):
-        for record in self:
-            for attachment in record.attachment_ids:
-                if attachment.file_size > 25 * 1024 * 1024:
-                    raise ValidationError("File size exceeds the maximum limit of 25MB.")
-
     @api.constrains('name', 'target_entity', 'start_date', 'end_date', 'attachment_ids')
-    def _validate_all_fields(self):
-        """Comprehensive validation of all field formats"""
-        error_messages = []
-
-        # Validate name
-        if not self.name or not isinstance(self.name, str):
-            error_messages.append(_("Title: Invalid data format"))
-        elif not self.name.strip():
-            error_messages.append(_("Title: Cannot be empty"))
-        elif len(self.name) > 250:
-            error_messages.append(_("Title: Cannot exceed 250 characters"))
-
-        # Validate target entity
-        if not self.target_entity or not isinstance(self.target_entity, str):
-            error_messages.append(_("Target Entity: Invalid data format"))
-        elif not self.target_entity.strip():
-            error_messages.append(_("Target Entity: Cannot be empty"))
-        elif not re.match(r'^[\w\s\-]+$', self.target_entity):
-            error_messages.append(_("Target Entity: Contains invalid characters"))
-
-        # Validate dates
-        try:
-            if self.start_date:
-                datetime.strptime(str(self.start_date), '%Y-%m-%d')
-            if self.end_date:
-                datetime.strptime(str(self.end_date), '%Y-%m-%d')
-        except ValueError:
-            error_messages.append(_("Date fields: Invalid format (use YYYY-MM-DD)"))
-
-        # Validate date logic
-        if self.start_date and self.end_date and self.start_date > self.end_date:
-            error_messages.append(_("End Date must be after Start Date"))
-
-        # Validate attachments (if any)
-        for attachment in self.attachment_ids:
-            if attachment.file_size > 25 * 1024 * 1024:
-                error_messages.append(_("Attachment size exceeds 25MB limit"))
-            if attachment.mimetype not in ['application/pdf',
-                                           'application/msword',
-                                           'image/jpeg',
-                                           'image/png']:
-                error_messages.append(_("Invalid file type for attachments"))
-
-        if error_messages:
-            full_message = _(
-                "One or more fields contain invalid data. Please review and correct:\n\n") + \
-                           "\n".join(f"- {msg}" for msg in error_messages)
-            raise ValidationError(full_message)
+    def _check_inspection_rules(self):
+        self._validate_inspection_rules()
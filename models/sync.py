@@ -0,0 +1,143 @@
+import base64
+import json
+from datetime import datetime
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# records sent to offline devices, with the fields they need
+SYNC_MODELS = {
+    'inspection.type': ['name', 'state', 'required_minimum_score', 'is_active'],
+    'inspection.item': ['name', 'item_type', 'sequence', 'inspection_type_id', 'is_mandatory',
+                        'response', 'correct_response', 'score'],
+    'inspection.visit': ['name', 'target_entity', 'start_date', 'end_date', 'status', 'plan_id',
+                         'inspector', 'active'],
+}
+TOMBSTONE_MODEL = 'inspection.sync.tombstone'
+# write dates of the cursor keep their microseconds
+CURSOR_DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+class InspectionSyncTombstone(models.Model):
+    """Trace of a deleted record, so that devices can drop their copy."""
+    _name = 'inspection.sync.tombstone'
+    _description = 'Inspection Sync Tombstone'
+    _order = 'write_date, id'
+
+    res_model = fields.Char(string='Model', required=True)
+    res_id = fields.Integer(string='Record ID', required=True)
+
+    def init(self):
+        super().init()
+        create_index(self.env.cr, 'inspection_sync_tombstone_cursor_idx', self._table, ['write_date', 'id'])
+
+    @api.model
+    def _record_deletion(self, records):
+        if records:
+            self.sudo().create([{'res_model': records._name, 'res_id': record_id} for record_id in records.ids])
+
+
+class InspectionSync(models.AbstractModel):
+    """Delta synchronisation of visits and checklists for offline devices.
+
+    A cursor holds, for every synced model and for the tombstones, the
+    ``(write_date, id)`` of the last record sent. Every page returns the
+    records changed after the cursor, in ``(write_date, id)`` order, with
+    the cursor to use for the next page. Records written since the start of
+    a transaction still open are held back until it ends, see
+    :meth:`_get_sync_horizon`.
+    """
+    _name = 'inspection.sync'
+    _description = 'Inspection Sync'
+
+    @api.model
+    def _decode_cursor(self, cursor):
+        if not cursor:
+            return {}
+        try:
+            positions = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            for write_date, record_id in positions.values():
+                datetime.strptime(write_date, CURSOR_DATE_FORMAT)
+                if not isinstance(record_id, int):
+                    raise ValueError(record_id)
+        except (ValueError, TypeError, AttributeError):
+            raise UserError("Invalid synchronisation cursor.")
+        return positions
+
+    @api.model
+    def _encode_cursor(self, positions):
+        return base64.urlsafe_b64encode(json.dumps(positions, separators=(',', ':')).encode()).decode()
+
+    @api.model
+    def _get_sync_horizon(self):
+        """Return the start, in UTC, of the oldest transaction still open on
+        the database, other than the current one, if any.
+
+        ``write_date`` is the start of the writing transaction, not its
+        commit. A transaction still running may thus commit rows dated
+        before the rows already sent, behind the cursor of the devices;
+        rows written from the horizon on are kept for a later page.
+        """
+        self.env.cr.execute("""
+            SELECT min(xact_start) AT TIME ZONE 'UTC'
+              FROM pg_stat_activity
+             WHERE datname = current_database()
+               AND pid != pg_backend_pid()
+               AND xact_start IS NOT NULL
+        """)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _read_changes(self, model_name, field_names, position, limit, horizon=None):
+        """Return the rows of ``model_name`` changed after ``position`` and
+        before ``horizon``, with the position of the last one. Positions keep
+        the microseconds of ``write_date``, which the ORM drops, so that
+        records written in the same second are neither skipped nor sent
+        twice. Archived records are sent too, with their ``active`` flag, so
+        that devices drop them."""
+        model = self.env[model_name].with_context(active_test=False)
+        query = model._search([], order='write_date, id', limit=limit)
+        write_date = SQL.identifier(model._table, 'write_date')
+        record_id = SQL.identifier(model._table, 'id')
+        if position:
+            query.add_where(SQL("(%s, %s) > (%s::timestamp, %s)", write_date, record_id, *position))
+        if horizon:
+            query.add_where(SQL("%s < %s", write_date, horizon))
+        self.env.cr.execute(query.select(SQL("to_char(%s, 'YYYY-MM-DD HH24:MI:SS.US')", write_date), record_id))
+        positions = self.env.cr.fetchall()
+        if not positions:
+            return [], position
+        record_ids = [row_id for __, row_id in positions]
+        rows = {row['id']: row for row in model.browse(record_ids).read(field_names, load=False)}
+        return [rows[row_id] for row_id in record_ids], list(positions[-1])
+
+    @api.model
+    def get_changes(self, cursor=None, limit=500):
+        """Return the records created, updated or deleted after ``cursor``.
+
+        :param str cursor: cursor returned by the previous page, if any
+        :param int limit: maximum number of rows per model in the page
+        :return: dict with the changed records per model, the deleted
+            records as ``[model, id]`` pairs, the next cursor and whether more
+            pages are available
+        """
+        positions = self._decode_cursor(cursor)
+        horizon = self._get_sync_horizon()
+        page = {'records': {}, 'deleted': [], 'has_more': False}
+        for model_name, field_names in list(SYNC_MODELS.items()) + [(TOMBSTONE_MODEL, ['res_model', 'res_id'])]:
+            rows, position = self._read_changes(model_name, field_names, positions.get(model_name), limit, horizon)
+            if len(rows) == limit:
+                page['has_more'] = True
+            if position:
+                positions[model_name] = position
+            if model_name == TOMBSTONE_MODEL:
+                page['deleted'] = [[row['res_model'], row['res_id']] for row in rows]
+            else:
+                page['records'][model_name] = [
+                    [row['id']] + [row[field_name] for field_name in field_names] for row in rows
+                ]
+        page['fields'] = SYNC_MODELS
+        page['cursor'] = self._encode_cursor(positions)
+        return page
@@ -0,0 +1,246 @@
+import re
+
+from odoo import _, api, models
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+TARGET_ENTITY_PATTERN = re.compile(r'^[\w\s\-]+$')
+ALLOWED_ATTACHMENT_MIMETYPES = frozenset([
+    'application/pdf',
+    'application/msword',
+    'image/jpeg',
+    'image/png',
+])
+MAX_ATTACHMENT_SIZE = 25 * 1024 * 1024
+# leading bytes identifying the allowed file types, whatever the client claims
+ATTACHMENT_SIGNATURES = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+]
+ATTACHMENT_SIGNATURE_SIZE = max(len(signature) for signature, __ in ATTACHMENT_SIGNATURES)
+
+
+class InspectionValidationMixin(models.AbstractModel):
+    """Declarative validation shared by inspection plans and visits.
+
+    Inheriting models describe their rules with the ``_inspection_*``
+    attributes and call :meth:`_validate_inspection_rules` from a single
+    constraint. The whole recordset is validated in one pass: attachment
+    metadata is read with one query, and every error of every record is
+    reported at once.
+    """
+    _name = 'inspection.validation.mixin'
+    _description = 'Inspection Validation Mixin'
+
+    # {field name: {'label': str, 'max_length': int, 'pattern': compiled regex}}
+    _inspection_field_rules = {}
+    # (start field, end field) whose order is checked
+    _inspection_date_range = ('start_date', 'end_date')
+    # many2many field of ir.attachment whose type and size are checked
+    _inspection_attachment_field = 'attachment_ids'
+
+    def _get_attachment_metadata(self):
+        """Return the name, size and actual type of the attachments. The type
+        is sniffed from the first bytes of the stored file instead of being
+        taken from the mimetype sent by the client."""
+        attachments = self.mapped(self._inspection_attachment_field).sudo()
+        return {
+            attachment.id: {
+                'name': attachment.name,
+                'file_size': attachment.file_size,
+                'mimetype': self._guess_attachment_mimetype(self._read_attachment_header(attachment)),
+            }
+            for attachment in attachments
+        }
+
+    @api.model
+    def _read_attachment_header(self, attachment):
+        """Return the leading bytes of an attachment, read from the filestore
+        without loading the whole file."""
+        if attachment.store_fname:
+            try:
+                with open(attachment._full_path(attachment.store_fname), 'rb') as stored_file:
+                    return stored_file.read(ATTACHMENT_SIGNATURE_SIZE)
+            except OSError:
+                return b''
+        return (attachment.raw or b'')[:ATTACHMENT_SIGNATURE_SIZE]
+
+    @api.model
+    def _guess_attachment_mimetype(self, header):
+        for signature, mimetype in ATTACHMENT_SIGNATURES:
+            if header.startswith(signature):
+                return mimetype
+        return None
+
+    @api.model
+    def _get_canonical_attachments(self, checksums):
+        """Return the oldest attachment linked through the attachment field
+        for each of ``checksums``, as ``{checksum: attachment id}``."""
+        checksums = list(set(checksums) - {False, None})
+        if not checksums:
+            return {}
+        field = self._fields[self._inspection_attachment_field]
+        self.env['ir.attachment'].flush_model(['checksum'])
+        self.flush_model([field.name])
+        self.env.cr.execute(SQL("""
+            SELECT DISTINCT ON (attachment.checksum) attachment.checksum, attachment.id
+              FROM ir_attachment attachment
+              JOIN %(relation)s rel ON rel.%(column)s = attachment.id
+             WHERE attachment.checksum = ANY(%(checksums)s)
+          ORDER BY attachment.checksum, attachment.id
+        """, relation=SQL.identifier(field.relation), column=SQL.identifier(field.column2), checksums=checksums))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _find_attachment(self, checksum):
+        """Return the attachment already uploaded with content ``checksum``,
+        so that clients can link it instead of uploading the file again."""
+        attachment_id = self._get_canonical_attachments([checksum]).get(checksum)
+        return self.env['ir.attachment'].browse(attachment_id).exists()
+
+    def _deduplicate_attachments(self):
+        """Replace the attachments of the records by the oldest linked
+        attachment with the same content, and delete the copies uploaded for
+        this model that are no longer linked anywhere. Identical files then
+        share one attachment and one stored file; the shared attachment
+        keeps its owner, see :meth:`_release_shared_attachments`."""
+        field = self._fields[self._inspection_attachment_field]
+        attachments = self.mapped(field.name).sudo()
+        canonical = self._get_canonical_attachments(attachments.mapped('checksum'))
+        duplicates = attachments.filtered(
+            lambda attachment: canonical.get(attachment.checksum, attachment.id) != attachment.id
+        )
+        if not duplicates:
+            return
+        self.env.cr.execute(SQL("""
+            WITH mapping AS (
+                SELECT unnest(%(duplicate_ids)s::int[]) AS duplicate_id, unnest(%(canonical_ids)s::int[]) AS canonical_id
+            ), relinked AS (
+                INSERT INTO %(relation)s (%(column1)s, %(column2)s)
+                     SELECT rel.%(column1)s, mapping.canonical_id
+                       FROM %(relation)s rel
+                       JOIN mapping ON mapping.duplicate_id = rel.%(column2)s
+                ON CONFLICT DO NOTHING
+            )
+            DELETE FROM %(relation)s rel
+                  USING mapping
+                  WHERE rel.%(column2)s = mapping.duplicate_id
+            """,
+            duplicate_ids=duplicates.ids,
+            canonical_ids=[canonical[attachment.checksum] for attachment in duplicates],
+            relation=SQL.identifier(field.relation),
+            column1=SQL.identifier(field.column1),
+            column2=SQL.identifier(field.column2),
+        ))
+        self.invalidate_model([field.name])
+        unused = duplicates.filtered(lambda attachment: attachment.res_model == self._name)
+        unused -= unused.browse(self._get_linked_attachment_ids(unused.ids))
+        unused.unlink()
+
+    @api.model
+    def _get_linked_attachment_ids(self, attachment_ids):
+        """Return those of ``attachment_ids`` still linked to a record through
+        any many2many field of ir.attachment."""
+        relations = {
+            (field.relation, field.column2)
+            for model in self.env.registry.values() if not model._abstract
+            for field in model._fields.values()
+            if field.type == 'many2many' and field.comodel_name == 'ir.attachment' and field.store
+        }
+        if not attachment_ids or not relations:
+            return set()
+        self.env.flush_all()
+        self.env.cr.execute(SQL(" UNION ").join(
+            SQL("SELECT %s FROM %s WHERE %s = ANY(%s)",
+                SQL.identifier(column), SQL.identifier(relation), SQL.identifier(column), list(attachment_ids))
+            for relation, column in sorted(relations)
+        ))
+        return {attachment_id for attachment_id, in self.env.cr.fetchall()}
+
+    def _release_shared_attachments(self):
+        """Hand the attachments owned by the records and shared with other
+        records over to one of those, so that deleting the records, which
+        deletes the attachments they own, keeps the shared files."""
+        field = self._fields[self._inspection_attachment_field]
+        self.flush_model([field.name])
+        self.env['ir.attachment'].flush_model(['res_model', 'res_id'])
+        self.env.cr.execute(SQL("""
+            UPDATE ir_attachment attachment
+               SET res_id = shared.record_id
+              FROM (
+                    SELECT rel.%(column2)s AS attachment_id, min(rel.%(column1)s) AS record_id
+                      FROM %(relation)s rel
+                      JOIN ir_attachment owned ON owned.id = rel.%(column2)s
+                     WHERE owned.res_model = %(model)s
+                       AND owned.res_id = ANY(%(ids)s)
+                       AND rel.%(column1)s != ALL(%(ids)s)
+                  GROUP BY rel.%(column2)s
+                   ) shared
+             WHERE attachment.id = shared.attachment_id
+         RETURNING attachment.id
+            """,
+            relation=SQL.identifier(field.relation),
+            column1=SQL.identifier(field.column1),
+            column2=SQL.identifier(field.column2),
+            model=self._name,
+            ids=self.ids,
+        ))
+        released_ids = [attachment_id for attachment_id, in self.env.cr.fetchall()]
+        self.env['ir.attachment'].browse(released_ids).invalidate_recordset(['res_id'])
+
+    def _check_field_rules(self, record):
+        messages = []
+        for field_name, rule in self._inspection_field_rules.items():
+            value = record[field_name]
+            label = str(rule['label'])
+            if not value or not value.strip():
+                messages.append(_("%s: Cannot be empty", label))
+            elif rule.get('max_length') and len(value) > rule['max_length']:
+                messages.append(_("%s: Cannot exceed %s characters", label, rule['max_length']))
+            elif rule.get('pattern') and not rule['pattern'].match(value):
+                messages.append(_("%s: Contains invalid characters", label))
+        return messages
+
+    def _check_date_range(self, record):
+        start_field, end_field = self._inspection_date_range
+        start_date, end_date = record[start_field], record[end_field]
+        if start_date and end_date and start_date > end_date:
+            return [_("End Date must be greater than or equal to Start Date.")]
+        return []
+
+    def _check_attachments(self, record, metadata):
+        messages = []
+        for attachment_id in record[self._inspection_attachment_field].ids:
+            attachment = metadata[attachment_id]
+            if attachment['file_size'] > MAX_ATTACHMENT_SIZE:
+                messages.append(_("%s: File size exceeds the maximum limit of 25MB.", attachment['name']))
+            if attachment['mimetype'] not in ALLOWED_ATTACHMENT_MIMETYPES:
+                messages.append(_("%s: Invalid file type. Please upload a PDF, Word, or Image file.",
+                                  attachment['name']))
+        return messages
+
+    def _collect_validation_errors(self):
+        """Return the error messages of every invalid record, keyed by record."""
+        metadata = self._get_attachment_metadata()
+        errors = {}
+        for record in self:
+            messages = (
+                self._check_field_rules(record)
+                + self._check_date_range(record)
+                + self._check_attachments(record, metadata)
+            )
+            if messages:
+                errors[record] = messages
+        return errors
+
+    def _validate_inspection_rules(self):
+        errors = self._collect_validation_errors()
+        if not errors:
+            return
+        full_message = _("One or more fields contain invalid data. Please review and correct:\n")
+        for record, messages in errors.items():
+            full_message += "\n" + (record.display_name or "") + "\n"
+            full_message += "\n".join(f"- {message}" for message in messages) + "\n"
+        raise ValidationError(full_message)
@@ -0,0 +1,101 @@
+from odoo import api, fields, models
+
+# visit fields aggregated by the report
+REPORT_FIELDS = {'start_date', 'end_date', 'status', 'inspector', 'plan_id'}
+
+
+class InspectionVisitReport(models.Model):
+    """Pre-aggregated visit statistics per month, inspector, department, plan
+    and status.
+
+    The table is only written by :meth:`_refresh`: visit changes queue the
+    months they affect, and the refresh job recomputes those months only.
+    """
+    _name = 'inspection.visit.report'
+    _description = 'Inspection Visit Analysis'
+    _order = 'month desc'
+    _rec_name = 'month'
+
+    month = fields.Date(string='Month', readonly=True, index=True)
+    inspector_id = fields.Many2one('inspection.inspector', string='Inspector', readonly=True)
+    department_id = fields.Many2one('hr.department', string='Department', readonly=True)
+    plan_id = fields.Many2one('inspection.plan', string='Inspection Plan', readonly=True)
+    status = fields.Selection([
+        ('new', 'New'),
+        ('in_progress', 'In progress'),
+        ('completed', 'Completed'),
+        ('submitted', 'Submitted'),
+    ], string='Status', readonly=True)
+    visit_count = fields.Integer(string='Visits', readonly=True)
+    day_count = fields.Integer(string='Visit Days', readonly=True)
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS inspection_visit_report_dirty (
+                month date PRIMARY KEY
+            )
+        """)
+        self.env.cr.execute("SELECT 1 FROM inspection_visit_report LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _mark_dirty(self, dates):
+        """Queue the months of the given visit dates for the next refresh."""
+        dates = [date for date in dates if date]
+        if not dates:
+            return
+        self.env.cr.execute("""
+            INSERT INTO inspection_visit_report_dirty (month)
+            SELECT DISTINCT date_trunc('month', day)::date
+              FROM unnest(%s::date[]) day
+                ON CONFLICT DO NOTHING
+        """, [dates])
+
+    def _insert_rows(self, months=None):
+        self.env.cr.execute("""
+            INSERT INTO inspection_visit_report
+                   (month, inspector_id, department_id, plan_id, status, visit_count, day_count,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT date_trunc('month', visit.start_date)::date,
+                   visit.inspector,
+                   inspector.department_id,
+                   visit.plan_id,
+                   visit.status,
+                   count(*),
+                   sum(visit.end_date - visit.start_date + 1),
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM inspection_visit visit
+         LEFT JOIN inspection_inspector inspector ON inspector.id = visit.inspector
+             WHERE %(all_months)s
+                OR date_trunc('month', visit.start_date)::date = ANY(%(months)s::date[])
+          GROUP BY 1, 2, 3, 4, 5
+        """, {'uid': self.env.uid, 'all_months': months is None, 'months': months or []})
+
+    @api.model
+    def _refresh(self):
+        """Recompute the queued months only."""
+        self.env['inspection.visit'].flush_model()
+        self.env['inspection.inspector'].flush_model(['department_id'])
+        self.env.cr.execute("DELETE FROM inspection_visit_report_dirty RETURNING month")
+        months = [row[0] for row in self.env.cr.fetchall()]
+        if not months:
+            return
+        self.env.cr.execute("DELETE FROM inspection_visit_report WHERE month = ANY(%s)", [months])
+        self._insert_rows(months)
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole report."""
+        self.env['inspection.visit'].flush_model()
+        self.env['inspection.inspector'].flush_model(['department_id'])
+        self.env.cr.execute("DELETE FROM inspection_visit_report_dirty")
+        self.env.cr.execute("DELETE FROM inspection_visit_report")
+        self._insert_rows()
+        self.invalidate_model()
+
+    @api.model
+    def _cron_refresh(self):
+        self._refresh()
@@ -1,3 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from . import test_inspectors
+from . import test_inspection_items
+from . import test_inspection_plans
+from . import test_benchmark_indexes
+from . import test_benchmark_state_transitions
+from . import test_benchmark_suite
+from . import test_inspection_sync
+from . import test_inspection_export
@@ -0,0 +1,82 @@
+import time
+from contextlib import contextmanager
+
+from odoo.tests.common import TransactionCase
+
+
+class InspectionBenchmarkCase(TransactionCase):
+    """Seeding and measuring shared by the inspection benchmarks."""
+
+    TYPES = 200
+    ITEMS_PER_TYPE = 100
+    HISTORY_PER_TYPE = 100
+    PLANS = 200
+    VISITS_PER_PLAN = 100
+
+    @classmethod
+    def _seed_benchmark_data(cls):
+        """Insert the benchmark volumes with plain SQL and set ``cls.types``,
+        ``cls.plans`` and ``cls.inspectors``."""
+        cr = cls.env.cr
+        employee = cls.env['hr.employee'].create({'name': 'Benchmark Inspector'})
+        inspectors = cls.env['inspection.inspector'].create([{'name': employee.id}] * 20)
+        cls.env.flush_all()
+
+        cr.execute("""
+            INSERT INTO inspection_type (name, inspection_type_name, description, inspection_check_list,
+                                         resources, output_template, state, is_active)
+            SELECT 'Type ' || n, 'Type ' || n, 'Description', 'Check list', 'Resources', 'Template', 'draft', true
+              FROM generate_series(1, %s) n
+         RETURNING id
+        """, [cls.TYPES])
+        type_ids = [row[0] for row in cr.fetchall()]
+        cr.execute("""
+            INSERT INTO inspection_item (name, sequence, inspection_type_id, display_type, item_type, score)
+            SELECT 'Item ' || n, n, type_id, 'line_item', 'item', 1
+              FROM unnest(%s::int[]) type_id, generate_series(1, %s) n
+        """, [type_ids, cls.ITEMS_PER_TYPE])
+        cr.execute("""
+            INSERT INTO inspection_history (change_date, change_description, inspection_type_id)
+            SELECT now() - n * interval '1 hour', 'Change ' || n, type_id
+              FROM unnest(%s::int[]) type_id, generate_series(1, %s) n
+        """, [type_ids, cls.HISTORY_PER_TYPE])
+        cr.execute("""
+            INSERT INTO inspection_plan (name, description, start_date, end_date, status, active)
+            SELECT jsonb_build_object('en_US', 'Plan ' || n), 'Description', current_date, current_date + 365, 'draft',
+                   true
+              FROM generate_series(1, %s) n
+         RETURNING id
+        """, [cls.PLANS])
+        plan_ids = [row[0] for row in cr.fetchall()]
+        cr.execute("""
+            INSERT INTO inspection_visit (name, target_entity, start_date, end_date, status, plan_id, inspector,
+                                          active)
+            SELECT 'Visit ' || n, 'Entity ' || n, current_date + n % 365, current_date + n % 365,
+                   (ARRAY['new', 'in_progress', 'completed', 'submitted'])[1 + n % 4], plan_id,
+                   (%s::int[])[1 + n % %s], true
+              FROM unnest(%s::int[]) plan_id, generate_series(1, %s) n
+        """, [inspectors.ids, len(inspectors), plan_ids, cls.VISITS_PER_PLAN])
+        cr.execute("ANALYZE inspection_type, inspection_item, inspection_history, inspection_plan, inspection_visit")
+
+        cls.types = cls.env['inspection.type'].browse(type_ids)
+        cls.plans = cls.env['inspection.plan'].browse(plan_ids)
+        cls.inspectors = inspectors
+
+    @contextmanager
+    def _measure(self):
+        """Run the block on cold caches and fill the yielded dict with its
+        query count and wall time, flush and precommit hooks included."""
+        self.env.flush_all()
+        self.env.cr.precommit.run()
+        self.env.invalidate_all()
+        measure = {}
+        count0 = self.cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            yield measure
+            self.env.flush_all()
+            # history and tracking are written right before commit
+            self.env.cr.precommit.run()
+        finally:
+            measure['queries'] = self.cr.sql_log_count - count0
+            measure['seconds'] = time.perf_counter() - start
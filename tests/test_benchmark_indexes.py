@@ -0,0 +1,75 @@
+import logging
+
+from odoo.tests.common import tagged
+
+from .common import InspectionBenchmarkCase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'inspection_benchmark')
+class TestInspectionIndexes(InspectionBenchmarkCase):
+    """Compare the query plans of the hot inspection queries with and without
+    the module indexes. Run with ``--test-tags inspection_benchmark``."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._seed_benchmark_data()
+        cls.type_id = cls.types[0].id
+        cls.plan_id = cls.plans[0].id
+        cls.inspector_id = cls.inspectors[0].id
+
+    def _explain(self, query, params):
+        self.env.cr.execute("EXPLAIN " + query, params)
+        return "\n".join(row[0] for row in self.env.cr.fetchall())
+
+    def _compare_plans(self, index_name, query, params):
+        with_index = self._explain(query, params)
+        with self.env.cr.savepoint():
+            self.env.cr.execute(f'DROP INDEX "{index_name}"')
+            without_index = self._explain(query, params)
+        _logger.info("Query: %s\nWithout %s:\n%s\nWith %s:\n%s",
+                     query, index_name, without_index, index_name, with_index)
+        self.assertIn(index_name, with_index, f"{index_name} should be used")
+        self.assertNotIn(index_name, without_index)
+
+    def test_01_history_of_type(self):
+        self._compare_plans(
+            'inspection_history_type_date_idx',
+            "SELECT id FROM inspection_history WHERE inspection_type_id = %s "
+            "ORDER BY change_date DESC, id DESC LIMIT 80",
+            [self.type_id],
+        )
+
+    def test_02_items_of_type(self):
+        self._compare_plans(
+            'inspection_item_type_sequence_idx',
+            "SELECT id FROM inspection_item WHERE inspection_type_id = %s ORDER BY sequence, id",
+            [self.type_id],
+        )
+
+    def test_03_visits_of_plan(self):
+        self._compare_plans(
+            'inspection_visit__plan_id_index',
+            "SELECT id FROM inspection_visit WHERE plan_id = %s",
+            [self.plan_id],
+        )
+
+    def test_04_open_visits_of_inspector(self):
+        self._compare_plans(
+            'inspection_visit_active_open_inspector_idx',
+            "SELECT id, start_date, end_date FROM inspection_visit "
+            "WHERE inspector = %s AND status IN ('new', 'in_progress') AND active ORDER BY start_date",
+            [self.inspector_id],
+        )
+
+    def test_05_visit_picker_similarity_order(self):
+        if not self.env['inspection.visit']._has_trigram():
+            self.skipTest("pg_trgm is not available")
+        self._compare_plans(
+            'inspection_visit_search_trgm_idx',
+            "SELECT id FROM inspection_visit "
+            "ORDER BY %s <<-> (name || ' ' || target_entity), id LIMIT 8",
+            ['Entity 12'],
+        )
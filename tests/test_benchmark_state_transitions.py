@@ -0,0 +1,51 @@
+import logging
+
+from odoo.tests.common import tagged
+
+from .common import InspectionBenchmarkCase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'inspection_benchmark')
+class TestInspectionStateTransitions(InspectionBenchmarkCase):
+    """Compare tracked per-record approval with the bulk transition. Run with
+    ``--test-tags inspection_benchmark``."""
+
+    TYPES = 200
+
+    def _create_types(self):
+        return self.env['inspection.type'].create([{
+            'name': f'Benchmark Type {index}',
+            'inspection_type_name': f'Benchmark Type {index}',
+            'description': 'Description',
+            'inspection_check_list': 'Check list',
+            'resources': 'Resources',
+            'output_template': 'Template',
+            'state': 'to_approve',
+        } for index in range(self.TYPES)])
+
+    def test_01_bulk_approve(self):
+        tracked_types = self._create_types()
+        bulk_types = self._create_types()
+
+        def approve_one_by_one():
+            for inspection_type in tracked_types:
+                inspection_type.action_approve()
+
+        with self._measure() as tracked:
+            approve_one_by_one()
+        message_count = self.env['mail.message'].search_count([])
+        with self._measure() as bulk:
+            bulk_types.action_bulk_approve()
+        tracked_queries, tracked_time = tracked['queries'], tracked['seconds']
+        bulk_queries, bulk_time = bulk['queries'], bulk['seconds']
+
+        _logger.info(
+            "Approving %s inspection types: tracked %s queries in %.3fs, bulk %s queries in %.3fs",
+            self.TYPES, tracked_queries, tracked_time, bulk_queries, bulk_time,
+        )
+        self.assertEqual(set(bulk_types.mapped('state')), {'approved'})
+        self.assertLess(bulk_queries, tracked_queries, "The bulk transition should need fewer queries")
+        self.assertEqual(self.env['mail.message'].search_count([]), message_count + 1,
+                         "The bulk transition should log a single summary")
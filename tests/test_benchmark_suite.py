@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+
+from odoo.tests.common import tagged
+
+from .common import InspectionBenchmarkCase
+
+_logger = logging.getLogger(__name__)
+
+MODULE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+def _volume(name, default):
+    return int(os.environ.get(f'INSPECTION_BENCH_{name}', default))
+
+
+@tagged('post_install', '-at_install', '-standard', 'inspection_benchmark')
+class TestInspectionBenchmark(InspectionBenchmarkCase):
+    """Query counts and wall time of the hot inspection paths on seeded
+    volumes. Run with ``--test-tags inspection_benchmark``.
+
+    Volumes are read from the ``INSPECTION_BENCH_*`` environment variables.
+    The measures are written as JSON to ``INSPECTION_BENCH_OUTPUT``
+    (``bench_output.txt`` at the module root by default), and every scenario
+    fails when it exceeds its baseline in ``benchmark_baseline.json``.
+    """
+
+    PLANS = _volume('PLANS', 200)
+    VISITS_PER_PLAN = _volume('VISITS_PER_PLAN', 50)
+    TYPES = _volume('TYPES', 50)
+    ITEMS_PER_TYPE = _volume('ITEMS_PER_TYPE', 100)
+    HISTORY_PER_TYPE = _volume('HISTORY_PER_TYPE', 200)
+    ASSIGNED_VISITS = _volume('ASSIGNED_VISITS', 10000)
+    ASSIGNED_INSPECTORS = _volume('ASSIGNED_INSPECTORS', 200)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(BASELINE_PATH) as baseline_file:
+            cls.baseline = json.load(baseline_file)
+        cls.results = {}
+        cls._seed_benchmark_data()
+
+    @classmethod
+    def tearDownClass(cls):
+        output_path = os.environ.get('INSPECTION_BENCH_OUTPUT', os.path.join(MODULE_PATH, 'bench_output.txt'))
+        with open(output_path, 'w') as output_file:
+            json.dump({
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'volumes': {
+                    'plans': cls.PLANS,
+                    'visits_per_plan': cls.VISITS_PER_PLAN,
+                    'types': cls.TYPES,
+                    'items_per_type': cls.ITEMS_PER_TYPE,
+                    'history_per_type': cls.HISTORY_PER_TYPE,
+                    'assigned_visits': cls.ASSIGNED_VISITS,
+                    'assigned_inspectors': cls.ASSIGNED_INSPECTORS,
+                },
+                'results': cls.results,
+            }, output_file, indent=2, sort_keys=True)
+        _logger.info("Inspection benchmark results written to %s", output_path)
+        super().tearDownClass()
+
+    def _benchmark(self, scenario, callback):
+        """Run ``callback`` on cold caches, record its query count and wall
+        time, and check them against the baseline of ``scenario``."""
+        baseline = self.baseline[scenario]
+        try:
+            with self.assertQueryCount(baseline['queries']), self._measure() as measure:
+                callback()
+        finally:
+            self.results[scenario] = {
+                'queries': measure['queries'],
+                'seconds': round(measure['seconds'], 4),
+                'baseline_queries': baseline['queries'],
+                'baseline_seconds': baseline['seconds'],
+            }
+            _logger.info("Benchmark %s: %s", scenario, self.results[scenario])
+        self.assertLessEqual(self.results[scenario]['seconds'], baseline['seconds'],
+                             f"{scenario} is slower than its baseline")
+
+    def test_01_item_write(self):
+        items = self.types[0].inspection_items
+        self._benchmark('item_write', lambda: items.write({'sequence': 5, 'score': 2}))
+
+    def test_02_item_unlink(self):
+        items = self.types[1].inspection_items
+        self._benchmark('item_unlink', items.unlink)
+
+    def test_03_type_state_actions(self):
+        inspection_type = self.types[2]
+
+        def cycle():
+            inspection_type.action_to_approve()
+            inspection_type.action_approve()
+            inspection_type.action_reset_draft()
+
+        self._benchmark('type_state_actions', cycle)
+
+    def test_04_type_bulk_state_actions(self):
+        def cycle():
+            self.types.action_bulk_to_approve()
+            self.types.action_bulk_approve()
+            self.types.action_bulk_reset_draft()
+
+        self._benchmark('type_bulk_state_actions', cycle)
+
+    def test_05_plan_compute_visits_count(self):
+        self._benchmark('plan_compute_visits_count', self.plans._compute_visits_count)
+        self.assertEqual(self.plans[0].visits_count, self.VISITS_PER_PLAN)
+
+    def test_06_visit_constraints(self):
+        visits = self.plans[0].planned_visits_ids
+        self._benchmark('visit_constraints', visits._check_inspection_rules)
+
+    def test_07_plan_form_load(self):
+        specification = {
+            'name': {}, 'description': {}, 'start_date': {}, 'end_date': {}, 'status': {}, 'active': {},
+            'completion_date': {}, 'visits_count': {},
+            'planned_visits_ids': {'fields': {
+                'target_entity': {}, 'name': {}, 'start_date': {}, 'end_date': {}, 'status': {},
+            }},
+        }
+        self._benchmark('plan_form_load', lambda: self.plans[3].web_read(specification))
+
+    def test_08_type_form_load(self):
+        specification = {
+            'name': {}, 'state': {}, 'is_active': {}, 'description': {}, 'required_minimum_score': {},
+            'max_score': {}, 'total_score': {}, 'result': {}, 'history_count': {},
+            'inspection_items': {'fields': {
+                'sequence': {}, 'name': {}, 'display_type': {}, 'item_type': {}, 'is_mandatory': {},
+                'correct_response': {}, 'score': {}, 'section_score': {},
+            }},
+            'recent_history_ids': {'fields': {'change_date': {}, 'user_id': {'fields': {'display_name': {}}},
+                                              'change_description': {}}},
+        }
+        self._benchmark('type_form_load', lambda: self.types[3].web_read(specification))
+
+    def test_09_assign_inspectors(self):
+        employee = self.env['hr.employee'].create({'name': 'Assignment Inspector'})
+        inspectors = self.env['inspection.inspector'].create([{'name': employee.id}] * self.ASSIGNED_INSPECTORS)
+        # weekly occurrences after the seeded visits, all entities of an occurrence on the same dates
+        occurrences = 20
+        first_date = date.today() + timedelta(days=400)
+        periods = [
+            (first_date + timedelta(weeks=week), first_date + timedelta(weeks=week, days=1))
+            for week in range(occurrences)
+            for __ in range(self.ASSIGNED_VISITS // occurrences)
+        ]
+        result = {}
+        self._benchmark('assign_inspectors', lambda: result.update(inspectors._assign_periods(periods)))
+        self.assertEqual(len(result['inspector_ids']), len(periods))
+        self.assertTrue(all(result['inspector_ids']))
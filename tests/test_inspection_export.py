@@ -0,0 +1,82 @@
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install', 'inspection_management')
+class TestInspectionExport(TransactionCase):
+    def setUp(self):
+        super(TestInspectionExport, self).setUp()
+        employee = self.env['hr.employee'].create({'name': 'Export Inspector'})
+        self.inspector = self.env['inspection.inspector'].create({'name': employee.id})
+        self.plans = self.env['inspection.plan'].create([{
+            'name': name,
+            'description': 'Test Description',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=30),
+        } for name in ('Export Plan A', 'Export Plan B')])
+        self.visits = self.env['inspection.visit'].create([{
+            'name': f'Export Visit {index}',
+            'target_entity': f'Entity {index}',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=1),
+            'plan_id': self.plans[index % 2].id,
+            'inspector': self.inspector.id,
+        } for index in range(5)])
+
+    def _read_csv(self, data):
+        return list(csv.reader(io.StringIO(data.decode())))
+
+    def test_01_csv_export_reads_chunks_in_id_order(self):
+        domain = [('id', 'in', self.visits.ids)]
+        fileobj, filename, mimetype = self.env['inspection.export'].export(
+            'inspection.visit', domain, chunk_size=2)
+        with fileobj:
+            rows = self._read_csv(fileobj.read())
+        self.assertEqual(filename, 'inspection_visits.csv')
+        self.assertEqual(rows[0][0], 'Title')
+        self.assertEqual([row[0] for row in rows[1:]], self.visits.mapped('name'))
+        self.assertEqual(rows[1][4:], ['New', 'Export Plan A', self.inspector.display_name])
+
+    def test_02_per_plan_archive(self):
+        domain = [('id', 'in', self.visits.ids)]
+        fileobj, filename, mimetype = self.env['inspection.export'].export(
+            'inspection.visit', domain, per_plan=True)
+        with fileobj, zipfile.ZipFile(fileobj) as archive:
+            names = archive.namelist()
+            self.assertEqual(names, [f'Export_Plan_A-{self.plans[0].id}.csv', f'Export_Plan_B-{self.plans[1].id}.csv'])
+            self.assertEqual(len(self._read_csv(archive.read(names[0]))), 4)
+            self.assertEqual(len(self._read_csv(archive.read(names[1]))), 3)
+        self.assertEqual(mimetype, 'application/zip')
+
+    def test_03_archived_visits_on_request(self):
+        self.plans[1].action_archive()
+        domain = [('plan_id', 'in', self.plans.ids)]
+
+        fileobj, __, __ = self.env['inspection.export'].export('inspection.visit', domain)
+        with fileobj:
+            self.assertEqual(len(self._read_csv(fileobj.read())), 4, "Archived visits are not exported by default")
+        fileobj, __, __ = self.env['inspection.export'].export('inspection.visit', domain, include_archived=True)
+        with fileobj:
+            self.assertEqual(len(self._read_csv(fileobj.read())), 6)
+
+    def test_04_xlsx_export(self):
+        inspection_type = self.env['inspection.type'].create({
+            'name': 'Export Type',
+            'inspection_type_name': 'Export Type',
+            'description': 'Test Description',
+            'inspection_check_list': 'Test Check List',
+            'resources': 'Test Resources',
+            'output_template': 'Test Template',
+        })
+        self.env['inspection.item'].create([{
+            'name': f'Item {index}', 'inspection_type_id': inspection_type.id, 'score': 10,
+        } for index in range(3)])
+        fileobj, filename, mimetype = self.env['inspection.export'].export(
+            'inspection.item', [('inspection_type_id', '=', inspection_type.id)], file_format='xlsx')
+        with fileobj:
+            self.assertTrue(zipfile.is_zipfile(fileobj))
+        self.assertEqual(filename, 'inspection_items.xlsx')
@@ -0,0 +1,409 @@
+from odoo import fields
+from odoo.tests.common import TransactionCase, tagged
+from odoo.tools import mute_logger
+from datetime import timedelta
+from unittest.mock import patch
+import base64
+
+from ..models.inspection_types import HISTORY_PREVIEW_SIZE
+
+
+@tagged('post_install', '-at_install', 'inspection_management')
+class TestInspectionItems(TransactionCase):
+    def setUp(self):
+        super(TestInspectionItems, self).setUp()
+
+        self.inspection_type = self._create_type('Test Type')
+        self.other_type = self._create_type('Other Type')
+
+    def _create_type(self, name):
+        return self.env['inspection.type'].create({
+            'name': name,
+            'inspection_type_name': name,
+            'description': 'Test Description',
+            'inspection_check_list': 'Test Check List',
+            'resources': 'Test Resources',
+            'output_template': 'Test Template',
+        })
+
+    def _create_items(self, count, inspection_type=None):
+        inspection_type = inspection_type or self.inspection_type
+        return self.env['inspection.item'].create([{
+            'name': f'Item {index}',
+            'display_type': 'line_item',
+            'sequence': index,
+            'inspection_type_id': inspection_type.id,
+        } for index in range(count)])
+
+    def _count_queries(self, callback):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        count0 = self.cr.sql_log_count
+        callback()
+        self.env.flush_all()
+        return self.cr.sql_log_count - count0
+
+    def _history(self, inspection_type):
+        # history is written right before commit
+        self.env.cr.precommit.run()
+        return self.env['inspection.history'].search([('inspection_type_id', '=', inspection_type.id)])
+
+    def _create_import(self, lines, chunk_size=2, header='name,display_type,sequence,is_mandatory,score'):
+        content = '\n'.join([header] + lines) + '\n'
+        return self.env['inspection.item.import'].create({
+            'inspection_type_id': self.inspection_type.id,
+            'import_file': base64.b64encode(content.encode()),
+            'file_name': 'checklist.csv',
+            'chunk_size': chunk_size,
+            'state': 'running',
+        })
+
+    @tagged('inspection_item', 'history')
+    def test_01_write_history_content(self):
+        """Test that a write logs every changed item."""
+        items = self._create_items(3)
+        history_before = self._history(self.inspection_type)
+
+        items.write({'inspection_type_id': self.other_type.id})
+
+        new_history = self._history(self.inspection_type) - history_before
+        self.assertEqual(len(new_history), 1, "The changes of a transaction should be coalesced per type")
+        for item in items:
+            self.assertIn(item.name, new_history.change_description)
+        self.assertEqual(
+            new_history.change_description.count(
+                f"Field inspection_type_id changed from {self.inspection_type.display_name} "
+                f"to {self.other_type.display_name}"
+            ), 3, "Every changed item should be listed")
+
+    @tagged('inspection_item', 'history')
+    def test_02_write_without_change(self):
+        """Test that writing unchanged values does not log any history."""
+        items = self._create_items(3)
+        history_count = len(self._history(self.inspection_type))
+
+        items.write({'inspection_type_id': self.inspection_type.id})
+
+        self.assertEqual(len(self._history(self.inspection_type)), history_count,
+                         "Unchanged values should not be logged")
+
+    @tagged('inspection_item', 'history', 'performance')
+    def test_03_write_query_count_is_flat(self):
+        """Test that the audit cost of a write does not grow with the recordset."""
+        small_items = self._create_items(5)
+        large_items = self._create_items(100)
+
+        # warm up the ORM caches before counting
+        self._count_queries(lambda: small_items.write({'sequence': 1}))
+
+        small_count = self._count_queries(lambda: small_items.write({'sequence': 2}))
+        large_count = self._count_queries(lambda: large_items.write({'sequence': 2}))
+        self.assertEqual(large_count, small_count, "Re-sequencing cost should not depend on the number of items")
+
+        small_count = self._count_queries(lambda: small_items.write({'inspection_type_id': self.other_type.id}))
+        large_count = self._count_queries(lambda: large_items.write({'inspection_type_id': self.other_type.id}))
+        self.assertEqual(large_count, small_count, "Many2one diffing cost should not depend on the number of items")
+
+    @tagged('inspection_item', 'history')
+    def test_04_batch_create_history(self):
+        """Test that a batch create logs every created item in one history row."""
+        history_count = len(self._history(self.inspection_type))
+
+        items = self._create_items(10)
+
+        history = self._history(self.inspection_type)
+        self.assertEqual(len(history), history_count + 1, "Created items should be coalesced in one row")
+        for item in items:
+            self.assertIn(item.name, history[0].change_description)
+
+    @tagged('inspection_item', 'performance')
+    def test_05_create_query_count_is_flat(self):
+        """Test that creating items costs the same number of queries per batch."""
+        def create_items(count):
+            self._create_items(count)
+            # include the buffered history in the count
+            self.env.cr.precommit.run()
+
+        self._count_queries(lambda: create_items(5))
+
+        small_count = self._count_queries(lambda: create_items(5))
+        large_count = self._count_queries(lambda: create_items(200))
+        self.assertEqual(large_count, small_count, "Create cost should depend on the number of batches only")
+
+    @tagged('inspection_type')
+    def test_06_batch_create_type_sequence(self):
+        """Test that unnamed inspection types get distinct sequence names."""
+        types = self.env['inspection.type'].create([{
+            'inspection_type_name': f'Type {index}',
+            'description': 'Test Description',
+            'inspection_check_list': 'Test Check List',
+            'resources': 'Test Resources',
+            'output_template': 'Test Template',
+        } for index in range(3)])
+
+        self.assertEqual(len(set(types.mapped('name'))), 3, "Each type should get its own sequence number")
+
+    @tagged('inspection_item', 'history')
+    def test_07_history_coalesced_per_type(self):
+        """Test that the events of a transaction give one history row per type."""
+        items = self._create_items(2) | self._create_items(2, self.other_type)
+        history_before = self._history(self.inspection_type) | self._history(self.other_type)
+
+        items.write({'sequence': 50})
+        items[:1].create_inspection_history("Manual entry")
+
+        new_history = (self._history(self.inspection_type) | self._history(self.other_type)) - history_before
+        self.assertEqual(len(new_history), 2, "One history row should be written per type")
+        self.assertEqual(set(new_history.inspection_type_id.ids), {self.inspection_type.id, self.other_type.id})
+        self.assertIn("Manual entry", new_history.filtered(
+            lambda history: history.inspection_type_id == self.inspection_type).change_description)
+
+    @tagged('inspection_type', 'history')
+    def test_08_history_rollup(self):
+        """Test that history older than the retention period is rolled up into daily summaries."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'control_inspection_management.history_retention_days', 30)
+        self.env['ir.config_parameter'].sudo().set_param(
+            'control_inspection_management.history_rollup_chunk_size', 2)
+        old_date = fields.Datetime.now() - timedelta(days=60)
+        History = self.env['inspection.history']
+        old_history = History.create([{
+            'change_date': old_date + timedelta(minutes=index),
+            'change_description': f'Old change {index}',
+            'inspection_type_id': self.inspection_type.id,
+        } for index in range(5)])
+        recent_history = History.create({
+            'change_description': 'Recent change',
+            'inspection_type_id': self.inspection_type.id,
+        })
+
+        History._cron_rollup_history(auto_commit=False)
+
+        self.assertFalse(old_history.exists(), "Old history should be removed")
+        self.assertTrue(recent_history.exists(), "Recent history should be kept")
+        summary = self.env['inspection.history.summary'].search([('inspection_type_id', '=', self.inspection_type.id)])
+        self.assertEqual(sum(summary.mapped('change_count')), 5, "Every old row should be counted")
+        self.assertEqual(summary.mapped('day'), [old_date.date()] * len(summary))
+
+    @tagged('inspection_type', 'history')
+    def test_09_recent_history_is_bounded(self):
+        """Test that the type form only loads the latest history rows."""
+        self.env['inspection.history'].create([{
+            'change_description': f'Change {index}',
+            'inspection_type_id': self.inspection_type.id,
+        } for index in range(HISTORY_PREVIEW_SIZE + 5)])
+
+        self.assertEqual(len(self.inspection_type.recent_history_ids), HISTORY_PREVIEW_SIZE)
+        self.assertGreaterEqual(self.inspection_type.history_count, HISTORY_PREVIEW_SIZE + 5)
+
+    # ========== Scoring ==========
+    def _create_checklist(self):
+        Item = self.env['inspection.item']
+        section = Item.create({'name': 'Section A', 'display_type': 'line_section', 'sequence': 1,
+                               'inspection_type_id': self.inspection_type.id})
+        items = Item.create([{
+            'name': name,
+            'display_type': 'line_item',
+            'sequence': sequence,
+            'score': score,
+            'correct_response': correct,
+            'is_mandatory': mandatory,
+            'inspection_type_id': self.inspection_type.id,
+        } for name, sequence, score, correct, mandatory in [
+            ('Item A1', 2, 30, True, True),
+            ('Item A2', 3, 20, False, False),
+            ('Item B1', 5, 50, True, False),
+        ]])
+        section_b = Item.create({'name': 'Section B', 'display_type': 'line_section', 'sequence': 4,
+                                 'inspection_type_id': self.inspection_type.id})
+        return section | section_b, items
+
+    @tagged('inspection_type', 'scoring')
+    def test_10_score_and_result(self):
+        """Test that the score only counts correct items and drives the result."""
+        sections, items = self._create_checklist()
+        self.inspection_type.required_minimum_score = 70
+
+        self.assertEqual(self.inspection_type.max_score, 100, "Sections should not be scored")
+        self.assertEqual(self.inspection_type.total_score, 80, "Only correct items should be scored")
+        self.assertEqual(self.inspection_type.result, 'pass')
+
+        items[0].correct_response = False
+        self.assertEqual(self.inspection_type.total_score, 50, "The score should follow item changes")
+        self.assertEqual(self.inspection_type.mandatory_failed_count, 1)
+        self.assertEqual(self.inspection_type.result, 'fail', "A failed mandatory item should fail the inspection")
+
+    @tagged('inspection_type', 'scoring')
+    def test_11_section_subtotals(self):
+        """Test that every section sums the items that follow it."""
+        sections, items = self._create_checklist()
+
+        self.assertEqual(sections[0].section_score, 30)
+        self.assertEqual(sections[0].section_max_score, 50)
+        self.assertEqual(sections[1].section_score, 50)
+        self.assertEqual(sections[1].section_max_score, 50)
+
+    @tagged('inspection_type', 'scoring')
+    def test_12_batch_rescoring(self):
+        """Test that scores can be recomputed in batches."""
+        self._create_checklist()
+        self.env.cr.execute("UPDATE inspection_type SET total_score = 0, result = 'fail' WHERE id = %s",
+                            [self.inspection_type.id])
+        self.inspection_type.invalidate_recordset()
+
+        self.env['inspection.type']._recompute_scores(batch_size=1)
+
+        self.assertEqual(self.inspection_type.total_score, 80)
+
+    # ========== Checklist Templates ==========
+    @tagged('inspection_type', 'template')
+    def test_13_compiled_checklist_template(self):
+        """Test the structure of a compiled checklist."""
+        sections, items = self._create_checklist()
+
+        template = self.inspection_type._get_checklist_template()
+
+        self.assertEqual([section.id for section in template], sections.ids)
+        self.assertEqual([item.name for item in template[0].items], ['Item A1', 'Item A2'])
+        self.assertEqual([item.name for item in template[1].items], ['Item B1'])
+        self.assertTrue(template[0].items[0].is_mandatory)
+        self.assertEqual(template[1].items[0].score, 50)
+
+    @tagged('inspection_type', 'template')
+    def test_14_checklist_template_cache_invalidation(self):
+        """Test that approved templates are cached and invalidated on item changes."""
+        sections, items = self._create_checklist()
+        self.inspection_type.action_to_approve()
+        self.inspection_type.action_approve()
+
+        template = self.inspection_type._get_checklist_template()
+        self.assertIs(self.inspection_type._get_checklist_template(), template, "Approved templates should be cached")
+
+        items[2].score = 40
+        template = self.inspection_type._get_checklist_template()
+        self.assertEqual(template[1].items[0].score, 40, "Item changes should invalidate the template")
+
+        items[2].unlink()
+        template = self.inspection_type._get_checklist_template()
+        self.assertFalse(template[1].items, "Deleted items should leave the template")
+
+    # ========== State Transitions ==========
+    @tagged('inspection_type', 'state')
+    def test_15_bulk_transition(self):
+        """Test that a bulk transition only moves allowed records and does not track fields."""
+        types = self.inspection_type | self.other_type
+        self.other_type.action_cancel()
+        self.env.cr.precommit.run()
+        tracking_count = self.env['mail.tracking.value'].search_count([])
+
+        moved = types._bulk_transition('to_approve')
+        self.env.cr.precommit.run()
+
+        self.assertEqual(moved, self.inspection_type, "Only draft types can be submitted for approval")
+        self.assertEqual(self.inspection_type.state, 'to_approve')
+        self.assertEqual(self.other_type.state, 'cancelled')
+        self.assertEqual(self.env['mail.tracking.value'].search_count([]), tracking_count,
+                         "A bulk transition should not write tracking values")
+        self.assertIn('bulk update', self.inspection_type.message_ids[0].body)
+        self.assertIn(self.inspection_type.display_name, self.inspection_type.message_ids[0].body)
+
+    @tagged('inspection_item', 'import')
+    def test_16_chunked_checklist_import(self):
+        """Test that an import validates rows and logs one history line per chunk."""
+        history_count = len(self._history(self.inspection_type))
+        job = self._create_import([
+            'Hygiene,line_section,,,',
+            'Clean floor,line_item,,yes,20',
+            'Too much,line_item,,,150',
+            ',line_item,,,10',
+            '"Fire, exits",line_item,,,30',
+        ])
+
+        job._run(auto_commit=False)
+
+        items = self.inspection_type.inspection_items
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(items.mapped('name'), ['Hygiene', 'Clean floor', 'Fire, exits'])
+        self.assertEqual(items.mapped('item_type'), ['section', 'item', 'item'])
+        self.assertTrue(items[1].is_mandatory)
+        self.assertEqual((job.imported_count, job.error_count), (3, 2))
+        self.assertIn('Line 4: Score must not exceed 100.', job.error_log)
+        self.assertEqual(len(self._history(self.inspection_type)), history_count + 1,
+                         "The imported chunks should be logged in a single history entry")
+
+    @tagged('inspection_item', 'import')
+    def test_17_checklist_import_resumes_from_checkpoint(self):
+        """Test that an interrupted import resumes after its last chunk."""
+        job = self._create_import([f'Item {index},line_item,,,5' for index in range(5)])
+        import_chunk = type(job)._import_chunk
+        calls = []
+
+        def interrupted_chunk(self, rows):
+            calls.append(rows)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return import_chunk(self, rows)
+
+        with patch.object(type(job), '_import_chunk', interrupted_chunk), self.assertRaises(KeyboardInterrupt):
+            job._run(auto_commit=False)
+        self.assertEqual(job.imported_count, 2)
+        self.assertTrue(job.checkpoint)
+
+        job._run(auto_commit=False)
+
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(self.inspection_type.inspection_items.mapped('name'), [f'Item {index}' for index in range(5)])
+
+    @tagged('inspection_item', 'history')
+    def test_18_history_rolled_back_with_savepoint(self):
+        """Test that the history of changes rolled back to a savepoint is not written."""
+        items = self._create_items(2)
+        history_before = self._history(self.inspection_type)
+
+        with self.assertRaises(ZeroDivisionError), self.env.cr.savepoint():
+            items.write({'name': 'Rolled back'})
+            1 / 0
+        items.invalidate_recordset()
+        items[0].write({'sequence': 42})
+
+        new_history = self._history(self.inspection_type) - history_before
+        self.assertEqual(len(new_history), 1)
+        self.assertNotIn('Rolled back', new_history.change_description)
+        self.assertIn('Field sequence changed', new_history.change_description)
+
+    @tagged('inspection_item', 'import')
+    def test_19_failed_import_does_not_stop_the_others(self):
+        """Test that a malformed file or an unexpected error only fails its own import."""
+        malformed_job = self._create_import([f'"{"x" * 200000}",line_item,,,5'])
+        broken_job = self._create_import(['Broken,line_item,,,5'])
+        job = self._create_import(['Clean floor,line_item,,,20'])
+        run = type(job)._run
+
+        def broken_run(self, auto_commit=True):
+            if self == broken_job:
+                raise RuntimeError("unexpected failure")
+            return run(self, auto_commit=auto_commit)
+
+        with patch.object(type(job), '_run', broken_run), \
+                mute_logger('odoo.addons.control_inspection_management.models.item_import'):
+            self.env['inspection.item.import']._cron_run_imports(auto_commit=False)
+
+        self.assertEqual(malformed_job.state, 'failed')
+        self.assertIn('field larger than field limit', malformed_job.error_log)
+        self.assertEqual(broken_job.state, 'failed')
+        self.assertIn('unexpected failure', broken_job.error_log)
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.imported_count, 1)
+
+    @tagged('inspection_item', 'import')
+    def test_20_import_without_display_type_creates_items(self):
+        """Test that rows without a display type are imported as checklist items."""
+        job = self._create_import(['Clean floor,yes,20', 'Fire exits,,30'], header='name,is_mandatory,score')
+
+        job._run(auto_commit=False)
+
+        items = self.inspection_type.inspection_items
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(items.mapped('item_type'), ['item', 'item'])
+        self.assertEqual(items.mapped('score'), [20, 30])
+        self.assertEqual(items.mapped('is_mandatory'), [True, False])
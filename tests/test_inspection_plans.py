@@ -0,0 +1,485 @@
+from odoo.tests.common import TransactionCase, tagged
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import mute_logger
+from datetime import date, timedelta
+from psycopg2 import IntegrityError
+
+
+@tagged('post_install', '-at_install', 'inspection_management')
+class TestInspectionPlans(TransactionCase):
+    def setUp(self):
+        super(TestInspectionPlans, self).setUp()
+
+        self.test_employee = self.env['hr.employee'].create({
+            'name': 'Test Inspector',
+            'department_id': self.env.ref('hr.dep_rd').id,
+        })
+        self.test_inspector = self.env['inspection.inspector'].create({
+            'name': self.test_employee.id,
+        })
+        self.test_plan = self._create_plan('Test Plan')
+
+    def _create_plan(self, name):
+        return self.env['inspection.plan'].create({
+            'name': name,
+            'description': 'Test Description',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=30),
+        })
+
+    def _create_visits(self, count, plan=None, **values):
+        plan = plan or self.test_plan
+        return self.env['inspection.visit'].create([dict({
+            'name': f'Visit {index}',
+            'target_entity': f'Entity {index}',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=1),
+            'plan_id': plan.id,
+            'inspector': self.test_inspector.id,
+        }, **values) for index in range(count)])
+
+    # ========== Visit Counters ==========
+    @tagged('inspection_plan')
+    def test_01_visit_counters(self):
+        """Test that the stored visit counters follow visit creation and deletion."""
+        visits = self._create_visits(3)
+        self.assertEqual(self.test_plan.visits_count, 3, "Plan should have 3 visits")
+        self.assertEqual(self.test_plan.visits_new_count, 3, "All visits should be new")
+
+        visits[0].unlink()
+        self.assertEqual(self.test_plan.visits_count, 2, "Plan should have 2 visits after deletion")
+        self.assertEqual(self.test_plan.visits_new_count, 2, "Remaining visits should be new")
+
+    @tagged('inspection_plan')
+    def test_02_visit_counters_by_status(self):
+        """Test that the per-status counters are recomputed on status changes."""
+        visits = self._create_visits(3)
+        visits[0].write({'status': 'in_progress'})
+
+        self.assertEqual(self.test_plan.visits_count, 3, "Status changes should not change the total")
+        self.assertEqual(self.test_plan.visits_new_count, 2, "Two visits should still be new")
+        self.assertEqual(self.test_plan.visits_in_progress_count, 1, "One visit should be in progress")
+
+    # ========== Visit Generation ==========
+    @tagged('inspection_plan', 'generation')
+    def test_03_generate_recurring_visits(self):
+        """Test that recurring visits are generated for every entity and occurrence."""
+        result = self.test_plan.generate_recurring_visits(
+            ['Entity A', 'Entity B'], 'weekly', inspector=self.test_inspector,
+        )
+
+        occurrences = len(self.test_plan._get_recurrence_dates('weekly'))
+        self.assertEqual(result['visit_count'], 2 * occurrences, "One visit per entity and occurrence")
+        self.assertEqual(len(result['visits']), 2 * occurrences, "All visits should be created")
+        self.assertFalse(result['conflicts'], "There should be no conflicts on an empty plan")
+        self.assertEqual(self.test_plan.visits_count, 2 * occurrences)
+
+    @tagged('inspection_plan', 'generation')
+    def test_04_generate_dry_run_reports_conflicts(self):
+        """Test that a dry run reports conflicts without creating visits."""
+        self.test_plan.generate_recurring_visits(['Entity A'], 'weekly', inspector=self.test_inspector)
+        visits_count = self.test_plan.visits_count
+
+        result = self.test_plan.generate_recurring_visits(
+            ['Entity A', 'Entity B'], 'weekly', inspector=self.test_inspector, dry_run=True,
+        )
+
+        self.assertEqual(len(result['conflicts']), visits_count, "Existing visits should be reported as conflicts")
+        self.assertEqual(result['visit_count'], visits_count, "Only the new entity should be generated")
+        self.assertFalse(result['visits'], "A dry run should not create visits")
+        self.assertEqual(self.test_plan.visits_count, visits_count, "A dry run should not create visits")
+
+    # ========== Inspector Assignment ==========
+    def _create_inspectors(self, count):
+        employees = self.env['hr.employee'].create([{
+            'name': f'Balanced Inspector {index}',
+            'department_id': self.env.ref('hr.dep_rd').id,
+        } for index in range(count)])
+        return self.env['inspection.inspector'].create([{'name': employee.id} for employee in employees])
+
+    @tagged('inspection_visit', 'assignment')
+    def test_05_assign_periods_balances_load(self):
+        """Test that free inspectors get the same number of visits."""
+        inspectors = self._create_inspectors(3)
+        periods = [(date.today() + timedelta(days=index), date.today() + timedelta(days=index))
+                   for index in range(6)]
+
+        result = inspectors._assign_periods(periods)
+
+        self.assertEqual(result['overlaps'], 0, "Disjoint periods should not overlap")
+        self.assertEqual(sorted(result['load'].values()), [2, 2, 2], "Visits should be spread evenly")
+
+    @tagged('inspection_visit', 'assignment')
+    def test_06_assign_periods_avoids_overlaps(self):
+        """Test that an inspector busy on the dates is skipped."""
+        inspectors = self._create_inspectors(2)
+        busy_inspector = inspectors[0]
+        self.env['inspection.visit'].create({
+            'name': 'Busy Visit',
+            'target_entity': 'Busy Entity',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=2),
+            'plan_id': self.test_plan.id,
+            'inspector': busy_inspector.id,
+        })
+
+        result = inspectors._assign_periods([(date.today() + timedelta(days=1), date.today() + timedelta(days=1))])
+
+        self.assertEqual(result['inspector_ids'], [inspectors[1].id], "The free inspector should get the visit")
+        self.assertEqual(result['overlaps'], 0)
+
+    @tagged('inspection_visit', 'assignment')
+    def test_07_generate_with_automatic_assignment(self):
+        """Test that generated visits are assigned when no inspector is given."""
+        inspectors = self._create_inspectors(2)
+        department = self.env.ref('hr.dep_rd')
+
+        result = self.test_plan.generate_recurring_visits(['Entity A', 'Entity B'], 'weekly', department=department)
+
+        self.assertTrue(all(result['visits'].mapped('inspector')), "Every visit should have an inspector")
+        self.assertLessEqual(set(result['visits'].mapped('inspector').ids), set(
+            self.env['inspection.inspector']._get_available_inspectors(department).ids))
+        self.assertTrue(inspectors & result['visits'].mapped('inspector'))
+
+    # ========== Double Booking ==========
+    @tagged('inspection_visit', 'conflicts')
+    def test_08_inspector_conflicts(self):
+        """Test that overlapping visits of the same inspector are reported."""
+        first, second = self._create_visits(2)
+        later = self._create_visits(1, name='Later Visit', start_date=date.today() + timedelta(days=2),
+                                    end_date=date.today() + timedelta(days=3))
+
+        conflicts = (first | second | later)._get_inspector_conflicts()
+
+        self.assertEqual(conflicts[first], second, "Visits on the same dates should conflict")
+        self.assertEqual(conflicts[second], first, "Visits on the same dates should conflict")
+        self.assertFalse(conflicts[later], "Visits on other dates should not conflict")
+        self.assertEqual(first.conflicting_visit_ids, second)
+
+    @tagged('inspection_visit', 'conflicts')
+    def test_09_find_conflicts_for_candidates(self):
+        """Test conflict detection for visits that are not created yet."""
+        visit = self._create_visits(1)
+
+        conflicts = self.env['inspection.visit']._find_inspector_conflicts([
+            (self.test_inspector.id, date.today() + timedelta(days=1), date.today() + timedelta(days=4), None),
+            (self.test_inspector.id, date.today() + timedelta(days=2), date.today() + timedelta(days=4), None),
+        ])
+
+        self.assertEqual(conflicts, [set(visit.ids), set()], "Only the overlapping candidate should conflict")
+
+    # ========== Visit Names ==========
+    @tagged('inspection_visit', 'validation')
+    def test_10_unique_visit_name_per_plan(self):
+        """Test that visit names are unique within a plan only."""
+        self._create_visits(1)
+        other_plan = self._create_plan('Other Plan')
+        self._create_visits(1, plan=other_plan)
+
+        with self.assertRaises(IntegrityError), mute_logger('odoo.sql_db'):
+            self._create_visits(1)
+            self.env.flush_all()
+
+    # ========== Validation ==========
+    @tagged('inspection_visit', 'validation')
+    def test_11_validation_reports_every_record(self):
+        """Test that a batch is validated at once and every invalid record is reported."""
+        with self.assertRaises(ValidationError) as error:
+            self.env['inspection.visit'].create([{
+                'name': name,
+                'target_entity': entity,
+                'start_date': date.today(),
+                'end_date': date.today() + timedelta(days=1),
+                'plan_id': self.test_plan.id,
+                'inspector': self.test_inspector.id,
+            } for name, entity in [('Valid', 'Entity'), ('Bad Entity', 'Entity #1'), ('Bad Too', 'Entity $2')]])
+
+        self.assertIn('Bad Entity', str(error.exception))
+        self.assertIn('Bad Too', str(error.exception))
+        self.assertNotIn('Valid\n', str(error.exception))
+
+    @tagged('inspection_visit', 'validation')
+    def test_12_validation_of_attachments(self):
+        """Test that attachments of an invalid type are rejected."""
+        attachment = self.env['ir.attachment'].create({
+            'name': 'notes.txt',
+            'raw': b'plain text',
+            'mimetype': 'text/plain',
+        })
+        visit = self._create_visits(1)
+
+        with self.assertRaises(ValidationError) as error:
+            visit.write({'attachment_ids': [(4, attachment.id)]})
+        self.assertIn('notes.txt', str(error.exception))
+
+    # ========== Visit Status ==========
+    @tagged('inspection_visit', 'status')
+    def test_13_visit_status_transitions(self):
+        """Test that visits go through their statuses in bulk."""
+        visits = self._create_visits(5)
+
+        visits.action_start()
+        visits.action_complete()
+        self.assertEqual(set(visits.mapped('status')), {'completed'})
+        visits.action_submit()
+        self.assertEqual(set(visits.mapped('status')), {'submitted'})
+        self.assertEqual(self.test_plan.visits_submitted_count, 5)
+
+    @tagged('inspection_visit', 'status')
+    def test_14_visit_status_invalid_transition(self):
+        """Test that a transition from a wrong status is refused for the whole batch."""
+        visits = self._create_visits(2)
+        visits[0].action_start()
+
+        with self.assertRaises(UserError):
+            visits.action_complete()
+        self.assertEqual(visits.mapped('status'), ['in_progress', 'new'], "No visit should be changed")
+
+        with self.assertRaises(UserError):
+            visits[0].write({'name': 'Renamed'})
+
+    # ========== Plan Completion ==========
+    @tagged('inspection_plan', 'status')
+    def test_15_plan_completion_follows_visits(self):
+        """Test that a plan is completed once all its visits are submitted, and reopened otherwise."""
+        visits = self._create_visits(2)
+        visits.action_start()
+        visits.action_complete()
+        visits[0].action_submit()
+        self.assertEqual(self.test_plan.status, 'draft', "A plan with unsubmitted visits is not completed")
+
+        visits[1].action_submit()
+        self.assertEqual(self.test_plan.status, 'completed', "A plan with all visits submitted is completed")
+
+        self._create_visits(1, name='Extra Visit')
+        self.assertEqual(self.test_plan.status, 'draft', "A new visit should reopen the plan")
+
+    @tagged('inspection_plan', 'status')
+    def test_16_plan_completion_reconciliation(self):
+        """Test that the reconciliation job repairs drifted statuses."""
+        empty_plan = self._create_plan('Empty Plan')
+        self.env.cr.execute("UPDATE inspection_plan SET status = 'completed' WHERE id = %s", [empty_plan.id])
+        empty_plan.invalidate_recordset(['status'])
+
+        self.env['inspection.plan']._cron_reconcile_completion_status()
+
+        self.assertEqual(empty_plan.status, 'draft', "A plan without visits is not completed")
+
+    # ========== Visit Analysis ==========
+    @tagged('inspection_visit', 'report')
+    def test_17_visit_report_refresh(self):
+        """Test that the visit analysis only recomputes the months that changed."""
+        Report = self.env['inspection.visit.report']
+        next_month = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+        plan = self.env['inspection.plan'].create({
+            'name': 'Report Plan',
+            'description': 'Test Description',
+            'start_date': date.today(),
+            'end_date': next_month + timedelta(days=10),
+        })
+        visits = self._create_visits(2, plan=plan)
+        self._create_visits(1, plan=plan, name='Later Visit', start_date=next_month, end_date=next_month)
+        Report._refresh()
+
+        rows = Report.search([('plan_id', '=', plan.id)])
+        self.assertEqual(sum(rows.mapped('visit_count')), 3)
+        later_rows = rows.filtered(lambda row: row.month == next_month)
+        self.assertEqual(later_rows.visit_count, 1)
+
+        visits.action_start()
+        Report._refresh()
+
+        rows = Report.search([('plan_id', '=', plan.id)])
+        self.assertEqual(sum(rows.filtered(lambda row: row.status == 'in_progress').mapped('visit_count')), 2)
+        self.assertIn(later_rows, rows, "Unaffected months should not be recomputed")
+
+    # ========== Inspector Department ==========
+    @tagged('inspectors')
+    def test_18_inspector_department_is_synced(self):
+        """Test that the stored department and active flag follow the employee."""
+        other_department = self.env['hr.department'].create({'name': 'Other Department'})
+
+        self.test_employee.department_id = other_department
+        self.assertEqual(self.test_inspector.department_id, other_department)
+        self.assertEqual(
+            self.env['inspection.inspector'].search([('department_id', '=', other_department.id)]),
+            self.test_inspector)
+
+        self.test_employee.active = False
+        self.assertFalse(self.test_inspector.employee_active)
+        self.assertNotIn(self.test_inspector, self.env['inspection.inspector']._get_available_inspectors())
+
+    # ========== Visit Search ==========
+    @tagged('inspection_visit', 'search')
+    def test_19_name_search_on_title_and_entity(self):
+        """Test that the visit picker matches partial titles and target entities."""
+        visits = self._create_visits(3)
+        visits[1].target_entity = 'Harbour Warehouse'
+
+        results = self.env['inspection.visit'].name_search('bour ware', limit=5)
+        self.assertEqual([visit_id for visit_id, __ in results], visits[1].ids)
+
+        results = self.env['inspection.visit'].name_search('Visit', limit=2)
+        self.assertEqual(len(results), 2, "The picker should be limited to the top matches")
+
+    # ========== Attachments ==========
+    @tagged('inspection_visit', 'validation')
+    def test_20_attachment_type_is_sniffed(self):
+        """Test that the type of an attachment comes from its content, not its declared mimetype."""
+        spoofed = self.env['ir.attachment'].create({
+            'name': 'script.pdf',
+            'raw': b'#!/bin/sh\necho spoofed',
+            'mimetype': 'application/pdf',
+        })
+        visit = self._create_visits(1)
+
+        with self.assertRaises(ValidationError) as error:
+            visit.write({'attachment_ids': [(4, spoofed.id)]})
+        self.assertIn('script.pdf', str(error.exception))
+
+    @tagged('inspection_visit', 'attachment')
+    def test_21_identical_attachments_are_shared(self):
+        """Test that visits uploading the same file share a single attachment."""
+        content = b'%PDF-1.4 permit'
+        visits = self._create_visits(3)
+        uploads = self.env['ir.attachment'].create([{
+            'name': f'permit {index}.pdf',
+            'raw': content,
+            'res_model': 'inspection.visit',
+            'res_id': visit.id,
+        } for index, visit in enumerate(visits)])
+
+        for visit, upload in zip(visits, uploads):
+            visit.write({'attachment_ids': [(4, upload.id)]})
+
+        self.assertEqual(visits.mapped('attachment_ids'), uploads[0])
+        self.assertFalse((uploads - uploads[0]).exists(), "The duplicate uploads should be deleted")
+        self.assertEqual(self.env['inspection.visit']._find_attachment(uploads[0].checksum), uploads[0])
+
+    @tagged('inspection_visit', 'attachment')
+    def test_23_shared_attachment_survives_its_owner(self):
+        """Test that deleting the visit owning a shared attachment keeps it for the other visits."""
+        visits = self._create_visits(3)
+        uploads = self.env['ir.attachment'].create([{
+            'name': f'permit {index}.pdf',
+            'raw': b'%PDF-1.4 shared permit',
+            'res_model': 'inspection.visit',
+            'res_id': visit.id,
+        } for index, visit in enumerate(visits)])
+        # the plan still uses the second copy, which must not be deleted
+        self.test_plan.write({'attachment_ids': [(4, uploads[1].id)]})
+        for visit, upload in zip(visits, uploads):
+            visit.write({'attachment_ids': [(4, upload.id)]})
+        self.assertTrue(uploads[1].exists(), "A copy still linked to a plan should be kept")
+        self.assertFalse(uploads[2].exists())
+
+        visits[0].unlink()
+
+        self.assertTrue(uploads[0].exists(), "The shared attachment should outlive its owner")
+        self.assertEqual(uploads[0].res_id, visits[1].id)
+        self.assertEqual(visits[1:].mapped('attachment_ids'), uploads[0])
+
+    # ========== Archiving ==========
+    @tagged('inspection_plan', 'archive')
+    def test_22_archive_completed_plans(self):
+        """Test that plans completed long ago are archived with their visits, batch by batch."""
+        old_plan = self._create_plan('Old Plan')
+        recent_plan = self._create_plan('Recent Plan')
+        visits = self._create_visits(2, plan=old_plan) | self._create_visits(1, plan=recent_plan)
+        visits.action_start()
+        visits.action_complete()
+        visits.action_submit()
+        self.assertTrue(old_plan.completion_date)
+        self.env.cr.execute("UPDATE inspection_plan SET completion_date = now() - interval '400 days' WHERE id = %s",
+                            [old_plan.id])
+        old_plan.invalidate_recordset(['completion_date'])
+        self.env['ir.config_parameter'].sudo().set_param(
+            'control_inspection_management.plan_archive_batch_size', 1)
+
+        archived_count = self.env['inspection.plan']._cron_archive_completed_plans(auto_commit=False)
+
+        self.assertEqual(archived_count, 1)
+        self.assertFalse(old_plan.active)
+        self.assertTrue(recent_plan.active)
+        self.assertEqual(visits.mapped('active'), [False, False, True])
+        self.assertNotIn(old_plan, self.env['inspection.plan'].search([]))
+        self.assertIn(old_plan, self.env['inspection.plan'].search([('active', '=', False)]))
+        self.assertEqual(old_plan.visits_count, 2, "Archived plans keep counting their visits")
+
+        old_plan.action_unarchive()
+        self.assertTrue(all(visits.mapped('active')), "Visits are restored with their plan")
+
+    @tagged('inspection_visit', 'archive')
+    def test_24_archived_visit_transitions_are_checked(self):
+        """Test that archived visits cannot skip statuses either."""
+        visit = self._create_visits(1)
+        visit.action_archive()
+
+        with self.assertRaises(UserError):
+            visit.action_submit()
+        self.assertEqual(visit.status, 'new')
+
+    @tagged('inspection_visit', 'search')
+    def test_25_name_search_best_match_first(self):
+        """Test that the visit picker lists the closest matches first."""
+        if not self.env['inspection.visit']._has_trigram():
+            self.skipTest("pg_trgm is not available")
+        partial, exact = self._create_visits(2)
+        partial.target_entity = 'Depots Central'
+        exact.target_entity = 'Old Depot'
+
+        results = self.env['inspection.visit'].name_search('Depot', limit=2)
+        self.assertEqual([visit_id for visit_id, __ in results], [exact.id, partial.id])
+
+    @tagged('inspection_plan', 'generation')
+    def test_26_monthly_recurrence_keeps_short_months(self):
+        """Test that monthly visits from the 31st fall on the last day of the shorter months."""
+        year = date.today().year + 1
+        plan = self.env['inspection.plan'].create({
+            'name': 'Month End Plan',
+            'description': 'Month end visits',
+            'start_date': date(year, 1, 31),
+            'end_date': date(year, 5, 31),
+        })
+
+        dates = plan._get_recurrence_dates('monthly')
+        self.assertEqual(len(dates), 5, "No month should be skipped")
+        self.assertEqual(dates[1], date(year, 3, 1) - timedelta(days=1), "February keeps its last day")
+        self.assertEqual(dates[2], date(year, 3, 31), "Later months keep the start day")
+
+    @tagged('inspection_plan', 'generation')
+    def test_27_generate_dry_run_reports_invalid_entities(self):
+        """Test that a dry run reports the entities that would break the visit rules."""
+        result = self.test_plan.generate_recurring_visits(
+            ['Entity A', 'Entity/B'], 'weekly', inspector=self.test_inspector, dry_run=True,
+        )
+
+        occurrences = len(self.test_plan._get_recurrence_dates('weekly'))
+        self.assertEqual(result['visit_count'], occurrences, "Only the valid entity should be generated")
+        self.assertEqual(len(result['conflicts']), occurrences, "The invalid entity should be reported")
+        self.assertTrue(all(conflict.startswith('Entity/B') for conflict in result['conflicts']))
+
+    @tagged('inspection_visit', 'report')
+    def test_28_visit_report_follows_inspector_department(self):
+        """Test that the visit analysis moves the visits of an inspector who changes department."""
+        Report = self.env['inspection.visit.report']
+        self._create_visits(2)
+        Report._refresh()
+        other_department = self.env['hr.department'].create({'name': 'Other Department'})
+
+        self.test_employee.department_id = other_department
+        Report._refresh()
+
+        rows = Report.search([('inspector_id', '=', self.test_inspector.id)])
+        self.assertEqual(rows.department_id, other_department)
+        self.assertEqual(sum(rows.mapped('visit_count')), 2)
+
+    @tagged('inspection_plan', 'generation')
+    def test_29_generate_rejects_empty_interval_or_duration(self):
+        """Test that the generation refuses intervals and durations below one."""
+        for values in ({'interval': 0}, {'interval': -1}, {'duration': 0}):
+            with self.subTest(**values), self.assertRaises(UserError):
+                self.test_plan.generate_recurring_visits(
+                    ['Entity A'], 'monthly', inspector=self.test_inspector, dry_run=True, **values,
+                )
+        self.assertEqual(self.test_plan.visits_count, 0)
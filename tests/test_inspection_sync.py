@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import date, timedelta
+
+from odoo import sql_db
+from odoo.exceptions import UserError
+from odoo.tests.common import HttpCase, tagged
+
+
+@tagged('post_install', '-at_install', 'inspection_management')
+class TestInspectionSync(HttpCase):
+    def setUp(self):
+        super(TestInspectionSync, self).setUp()
+        self.env.ref('base.user_admin').groups_id += self.env.ref(
+            'control_inspection_management.group_inspection_manager')
+        employee = self.env['hr.employee'].create({'name': 'Sync Inspector'})
+        self.inspector = self.env['inspection.inspector'].create({'name': employee.id})
+        self.plan = self.env['inspection.plan'].create({
+            'name': 'Sync Plan',
+            'description': 'Test Description',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=30),
+        })
+        self.cursor = self.env['inspection.sync'].get_changes()['cursor']
+
+    def _create_visits(self, count):
+        return self.env['inspection.visit'].create([{
+            'name': f'Sync Visit {index}',
+            'target_entity': f'Entity {index}',
+            'start_date': date.today(),
+            'end_date': date.today() + timedelta(days=1),
+            'plan_id': self.plan.id,
+            'inspector': self.inspector.id,
+        } for index in range(count)])
+
+    def _visit_ids(self, page):
+        return [row[0] for row in page['records']['inspection.visit']]
+
+    def test_01_pages_follow_the_cursor(self):
+        """Records written in the same transaction share their write_date
+        and are still paged without gaps or duplicates."""
+        visits = self._create_visits(3)
+        first = self.env['inspection.sync'].get_changes(self.cursor, limit=2)
+        self.assertTrue(first['has_more'])
+        second = self.env['inspection.sync'].get_changes(first['cursor'], limit=2)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(self._visit_ids(first) + self._visit_ids(second), visits.ids)
+        third = self.env['inspection.sync'].get_changes(second['cursor'], limit=2)
+        self.assertEqual(self._visit_ids(third), [])
+
+    def test_02_deleted_records_are_sent_as_tombstones(self):
+        visits = self._create_visits(2)
+        cursor = self.env['inspection.sync'].get_changes(self.cursor)['cursor']
+        deleted_id = visits[0].id
+        visits[0].unlink()
+        page = self.env['inspection.sync'].get_changes(cursor)
+        self.assertEqual(page['deleted'], [['inspection.visit', deleted_id]])
+
+    def test_03_archived_visits_are_sent_inactive(self):
+        visits = self._create_visits(2)
+        cursor = self.env['inspection.sync'].get_changes(self.cursor)['cursor']
+        self.plan.action_archive()
+        # as if archived in a later transaction
+        self.env.flush_all()
+        self.env.cr.execute("UPDATE inspection_visit SET write_date = write_date + interval '1 minute' WHERE id = ANY(%s)",
+                            [visits.ids])
+
+        page = self.env['inspection.sync'].get_changes(cursor)
+        active_index = page['fields']['inspection.visit'].index('active') + 1
+        self.assertEqual(self._visit_ids(page), visits.ids)
+        self.assertEqual([row[active_index] for row in page['records']['inspection.visit']], [False, False])
+
+    def test_04_malformed_cursor_is_rejected(self):
+        for positions in ([1, 2], {'inspection.visit': [1, '2026-01-01 00:00:00.000000']},
+                          {'inspection.visit': ['yesterday', 1]}, {'inspection.visit': [1]}):
+            cursor = base64.urlsafe_b64encode(json.dumps(positions).encode()).decode()
+            with self.assertRaises(UserError):
+                self.env['inspection.sync'].get_changes(cursor)
+        with self.assertRaises(UserError):
+            self.env['inspection.sync'].get_changes('not a cursor')
+
+    def test_05_endpoint_returns_compressed_json(self):
+        visits = self._create_visits(2)
+        self.authenticate('admin', 'admin')
+        response = self.url_open(f'/inspection/sync?cursor={self.cursor}', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        page = json.loads(response.content)
+        self.assertEqual(self._visit_ids(page), visits.ids)
+        self.assertEqual(page['fields']['inspection.visit'][0], 'name')
+
+    def test_06_rows_of_open_transactions_are_held_back(self):
+        """Rows dated before the commit of a transaction still open are not
+        passed by the cursor before that transaction ends."""
+        other_cr = sql_db.db_connect(self.env.cr.dbname).cursor()
+        try:
+            other_cr.execute("SELECT now() AT TIME ZONE 'UTC'")
+            started = other_cr.fetchone()[0]
+            late, early = self._create_visits(2)
+            self.env.flush_all()
+            # ``late`` is written by the open transaction, ``early`` by a
+            # later one already committed
+            self.env.cr.execute("UPDATE inspection_visit SET write_date = %s WHERE id = %s", [started, late.id])
+            self.env.cr.execute("UPDATE inspection_visit SET write_date = %s WHERE id = %s",
+                                [started + timedelta(minutes=1), early.id])
+
+            page = self.env['inspection.sync'].get_changes(self.cursor)
+            self.assertEqual(self._visit_ids(page), [])
+        finally:
+            other_cr.close()
+
+        page = self.env['inspection.sync'].get_changes(page['cursor'])
+        self.assertEqual(self._visit_ids(page), [late.id, early.id])
@@ -0,0 +1,89 @@
+from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+
+
+class InspectionVisitGenerate(models.TransientModel):
+    _name = 'inspection.visit.generate'
+    _description = 'Generate Recurring Inspection Visits'
+
+    plan_id = fields.Many2one('inspection.plan', string='Inspection Plan', required=True)
+    target_entities = fields.Text(
+        string='Target Entities',
+        required=True,
+        help="One target entity per line"
+    )
+    frequency = fields.Selection(
+        [('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')],
+        string='Repeat',
+        required=True,
+        default='monthly'
+    )
+    interval = fields.Integer(string='Repeat Every', required=True, default=1)
+    duration = fields.Integer(string='Visit Duration (Days)', required=True, default=1)
+    inspector = fields.Many2one(
+        'inspection.inspector',
+        string="Inspector",
+        help="Leave empty to distribute the visits over the active inspectors"
+    )
+    department_id = fields.Many2one(
+        'hr.department',
+        string="Department",
+        help="Only distribute the visits over the inspectors of this department"
+    )
+
+    state = fields.Selection([('draft', 'Draft'), ('preview', 'Preview')], default='draft')
+    visit_count = fields.Integer(string='Visits To Create', readonly=True)
+    conflict_count = fields.Integer(string='Conflicts', readonly=True)
+    conflict_names = fields.Text(string='Conflicting Visits', readonly=True)
+    inspector_load = fields.Text(string='Inspector Load', readonly=True)
+
+    @api.constrains('interval', 'duration')
+    def _check_positive(self):
+        for record in self:
+            if record.interval < 1 or record.duration < 1:
+                raise ValidationError(_("Repeat interval and visit duration must be at least 1."))
+
+    def _get_target_entities(self):
+        self.ensure_one()
+        entities = (line.strip() for line in (self.target_entities or '').splitlines())
+        return list(dict.fromkeys(entity for entity in entities if entity))
+
+    def _generate(self, dry_run):
+        self.ensure_one()
+        return self.plan_id.generate_recurring_visits(
+            self._get_target_entities(),
+            self.frequency,
+            interval=self.interval,
+            duration=self.duration,
+            inspector=self.inspector,
+            department=self.department_id,
+            dry_run=dry_run,
+        )
+
+    def action_preview(self):
+        """Dry run: report the number of visits and the conflicts without
+        creating anything."""
+        self.ensure_one()
+        result = self._generate(dry_run=True)
+        self.write({
+            'state': 'preview',
+            'visit_count': result['visit_count'],
+            'conflict_count': len(result['conflicts']),
+            'conflict_names': "\n".join(result['conflicts']),
+            'inspector_load': "\n".join(
+                f"{inspector.display_name}: {result['load'][inspector.id]}"
+                for inspector in self.env['inspection.inspector'].browse(list(result['load']))
+            ),
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_generate(self):
+        self.ensure_one()
+        result = self._generate(dry_run=False)
+        return self.plan_id.action_view_visits() if result['visits'] else {'type': 'ir.actions.act_window_close'}